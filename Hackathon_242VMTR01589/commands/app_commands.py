@@ -5,10 +5,13 @@ AppCommands - Handles commands related to opening and managing applications.
 import os
 import subprocess
 import re
+import shutil
 import sys
-import webbrowser
 from pathlib import Path
 
+# Pattern for extracting the application name from a command
+APP_NAME_PATTERN = re.compile(r"(open|launch|start|run)\s+(?P<app_name>[\w\s]+)", re.IGNORECASE)
+
 class AppCommands:
     """
     Handles commands related to opening and managing applications.
@@ -88,6 +91,29 @@ class AppCommands:
                 "open_method": self._open_executable
             }
         }
+        
+        # Replace the username placeholder in paths once, up front
+        username = os.getenv("USERNAME") or ""
+        for app_info in self.app_mappings.values():
+            app_info["path"] = app_info["path"].replace("{username}", username)
+        
+        # Normalize app names once so lookups can compare them directly
+        self.app_mappings = {key.strip().lower(): app_info for key, app_info in self.app_mappings.items()}
+        
+        # App names with their info, longest first, for partial name matches
+        self.app_aliases = sorted(self.app_mappings.items(), key=lambda item: -len(item[0]))
+        
+        # Alternation of all known app names, longest first, to find the one
+        # mentioned in a requested name with a single scan
+        self.app_name_pattern = re.compile("|".join(re.escape(key) for key, _ in self.app_aliases))
+        
+        # Resolved executable path for each (path, alt_path) pair, or None if
+        # neither exists, so repeated opens skip the file system checks
+        self._resolved_paths = {}
+        
+        # Executable found on PATH for each unmapped app name; names that
+        # weren't found aren't kept, so apps installed later are picked up
+        self._which_paths = {}
     
     def process(self, command_text, match=None):
         """
@@ -114,18 +140,23 @@ class AppCommands:
             return match.group('app_name').strip().lower()
         
         # If no match, try to extract using regex
-        app_pattern = re.compile(r"(open|launch|start|run)\s+(?P<app_name>[\w\s]+)", re.IGNORECASE)
-        match = app_pattern.search(command_text)
+        match = APP_NAME_PATTERN.search(command_text)
         
         if match and 'app_name' in match.groupdict():
             return match.group('app_name').strip().lower()
         
-        # If still no match, just take everything after the command word
-        for cmd in ["open", "launch", "start", "run"]:
-            if cmd in command_text.lower():
-                parts = command_text.lower().split(cmd, 1)
-                if len(parts) > 1:
-                    return parts[1].strip()
+        # If still no match, just take everything after the first command word
+        command_lower = command_text.lower()
+        best_index = -1
+        best_end = 0
+        for cmd in ("open", "launch", "start", "run"):
+            index = command_lower.find(cmd)
+            if index != -1 and (best_index == -1 or index < best_index):
+                best_index = index
+                best_end = index + len(cmd)
+        
+        if best_index != -1:
+            return command_lower[best_end:].strip()
         
         return None
     
@@ -137,19 +168,36 @@ class AppCommands:
         # Normalize app name (remove extra spaces, convert to lowercase)
         app_name = app_name.strip().lower()
         
-        # Check if the app is in our mappings
-        for key, app_info in self.app_mappings.items():
-            if key in app_name or app_name in key:
-                # Replace username in path if needed
-                if "{username}" in app_info["path"]:
-                    username = os.getenv("USERNAME")
-                    app_info["path"] = app_info["path"].replace("{username}", username)
-                
-                # Open the application using the specified method
-                return app_info["open_method"](app_info["path"], app_info["alt_path"])
-        
-        # If not in mappings, try as a Windows app or command
+        # Check if the app is in our mappings, trying an exact match first
+        app_info = self.app_mappings.get(app_name)
+        if app_info is None:
+            # Then a known app name inside the requested name ("google chrome")
+            key_match = self.app_name_pattern.search(app_name)
+            if key_match:
+                app_info = self.app_mappings[key_match.group(0)]
+        if app_info is None:
+            # Then a partial app name ("calc" for "calculator")
+            app_info = next((info for key, info in self.app_aliases if app_name in key), None)
+        
+        if app_info:
+            # Open the application using the specified method
+            return app_info["open_method"](app_info["path"], app_info["alt_path"])
+        
+        # If not in mappings, try as an executable on the PATH
         try:
+            executable = self._which_paths.get(app_name)
+            if executable is None:
+                executable = shutil.which(app_name)
+                if executable:
+                    self._which_paths[app_name] = executable
+            
+            if executable:
+                # Launch directly (no intermediate shell) and detached from Nova
+                subprocess.Popen([executable], creationflags=getattr(subprocess, "DETACHED_PROCESS", 0))
+                return {"success": True, "message": ""}
+            
+            # Otherwise try as a Windows app or command, which the shell can
+            # find by other means (App Paths, multi-word names)
             subprocess.Popen(app_name, shell=True)
             return {"success": True, "message": ""}
         except Exception as e:
@@ -158,17 +206,26 @@ class AppCommands:
     def _open_executable(self, path, alt_path):
         """Open an executable file at the given path."""
         try:
-            if os.path.exists(path):
-                subprocess.Popen([path])
-                return {"success": True, "message": ""}
-            elif alt_path and os.path.exists(alt_path):
-                subprocess.Popen([alt_path])
+            if (path, alt_path) not in self._resolved_paths:
+                self._resolved_paths[(path, alt_path)] = self._resolve_executable(path, alt_path)
+            
+            resolved_path = self._resolved_paths[(path, alt_path)]
+            if resolved_path:
+                subprocess.Popen([resolved_path])
                 return {"success": True, "message": ""}
             else:
                 return {"success": False, "message": "Application path not found."}
         except Exception as e:
             return {"success": False, "message": str(e)}
     
+    def _resolve_executable(self, path, alt_path):
+        """Return the first existing path of path and alt_path, or None."""
+        if os.path.exists(path):
+            return path
+        elif alt_path and os.path.exists(alt_path):
+            return alt_path
+        return None
+    
     def _open_windows_app(self, app_name, _):
         """Open a Windows built-in application."""
         try:
@@ -180,6 +237,7 @@ class AppCommands:
     def _open_default_browser(self, _, __):
         """Open the default web browser."""
         try:
+            import webbrowser
             webbrowser.open("https://www.google.com")
             return {"success": True, "message": ""}
         except Exception as e:
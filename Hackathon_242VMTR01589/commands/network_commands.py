@@ -4,10 +4,28 @@ NetworkCommands - Handles commands related to network operations like WiFi, Blue
 
 import os
 import subprocess
+import concurrent.futures
 import re
 import socket
 import platform
 import sys
+import threading
+import time
+import queue
+
+# Marker written by the PowerShell worker after each command's output
+PS_END_MARKER = "===END==="
+
+# Longest wait, in seconds, for a command run by the PowerShell worker; a
+# command that takes longer is abandoned and the worker restarted
+PS_COMMAND_TIMEOUT = 30
+
+# How long, in seconds, to reuse the result of an IP address lookup
+IP_CACHE_TTL = 60
+
+# Response used when a command doesn't look like any known network command
+UNRECOGNIZED_RESPONSE = "I'm not sure which network command you want to execute. " \
+                        "Try saying 'turn on WiFi', 'turn off Bluetooth', or 'show my IP address'."
 
 class NetworkCommands:
     """
@@ -18,13 +36,40 @@ class NetworkCommands:
         """Initialize the network commands handler."""
         self.assistant = assistant
         
-        # Command patterns and their handlers
-        self.command_patterns = {
-            r"turn\s+(on|off)\s+(wifi|wireless)": self._toggle_wifi,
-            r"turn\s+(on|off)\s+bluetooth": self._toggle_bluetooth,
-            r"(show|what is|what's)\s+(my)?\s*(ip address)": self._show_ip_address,
-            r"(connect|disconnect)\s+(to|from)\s+(?P<network>.*)": self._manage_network_connection
-        }
+        # Command patterns and their handlers, compiled once up front.
+        # Each pattern is tagged with the literal anchors it requires.
+        self.command_patterns = [
+            (anchors, re.compile(pattern, re.IGNORECASE), handler)
+            for anchors, pattern, handler in [
+                ({"wifi", "wireless"}, r"turn\s+(on|off)\s+(wifi|wireless)", self._toggle_wifi),
+                ({"bluetooth"}, r"turn\s+(on|off)\s+bluetooth", self._toggle_bluetooth),
+                ({"ip"}, r"(show|what is|what's)\s+(my)?\s*(ip address)", self._show_ip_address),
+                ({"connect"}, r"(connect|disconnect)\s+(to|from)\s+(?P<network>.*)", self._manage_network_connection)
+            ]
+        ]
+        
+        # Single-pass prefilter over all anchors ("disconnect" contains "connect")
+        self.anchor_pattern = re.compile(r"wifi|wireless|bluetooth|ip|connect")
+        
+        # Long-lived PowerShell process used to run netsh/ipconfig (Windows only),
+        # started on first use so each command doesn't pay for a new process
+        self._ps = None
+        self._ps_lock = threading.Lock()
+        
+        # Output lines of the PowerShell worker, read on a separate thread so
+        # waiting for them can time out (None marks the end of the output)
+        self._ps_output = None
+        
+        # HTTP session for public IP lookups, created on first use, and the
+        # lookup in progress; only one runs at a time, since a session isn't
+        # safe to share between threads
+        self._session = None
+        self._public_ip_future = None
+        self._public_ip_lock = threading.Lock()
+        
+        # Last IP address response and when it was generated
+        self._ip_cache = None
+        self._ip_cache_time = 0.0
     
     def process(self, command_text, match=None):
         """
@@ -35,15 +80,22 @@ class NetworkCommands:
         
         # If match is provided, use it to determine the command
         if match:
-            for pattern, handler in self.command_patterns.items():
-                if re.match(pattern, match.group(0), re.IGNORECASE):
+            for _, pattern, handler in self.command_patterns:
+                if pattern.match(match.group(0)):
                     return handler(command_text, match)
         
-        # Otherwise, try to match the command
-        for pattern, handler in self.command_patterns.items():
-            match = re.search(pattern, command_lower, re.IGNORECASE)
-            if match:
-                return handler(command_text, match)
+        # Every network command contains one of the anchors, so skip the
+        # pattern and keyword checks entirely when none are present
+        found_anchors = set(self.anchor_pattern.findall(command_lower))
+        if not found_anchors:
+            return UNRECOGNIZED_RESPONSE
+        
+        # Otherwise, try only the patterns whose anchors were found
+        for anchors, pattern, handler in self.command_patterns:
+            if anchors & found_anchors:
+                match = pattern.search(command_lower)
+                if match:
+                    return handler(command_text, match)
         
         # Check for specific keywords if no pattern matches
         if "wifi" in command_lower or "wireless" in command_lower:
@@ -71,8 +123,7 @@ class NetworkCommands:
             return "Please specify the network name you want to connect to or disconnect from."
         
         # If no command is recognized
-        return "I'm not sure which network command you want to execute. " \
-               "Try saying 'turn on WiFi', 'turn off Bluetooth', or 'show my IP address'."
+        return UNRECOGNIZED_RESPONSE
     
     def _toggle_wifi(self, command_text, match, turn_on=None):
         """Toggle WiFi on or off."""
@@ -85,17 +136,18 @@ class NetworkCommands:
                 # Try to extract from command text
                 turn_on = "on" in command_text.lower() and not "off" in command_text.lower()
         
+        # The addresses may change once the network does
+        self._ip_cache = None
+        
         try:
             if os.name == 'nt':  # Windows
                 if turn_on:
                     # Turn WiFi on using netsh
-                    subprocess.run(["netsh", "interface", "set", "interface", "Wi-Fi", "enabled"], 
-                                  capture_output=True, text=True, check=True)
+                    self._run_command(["netsh", "interface", "set", "interface", "Wi-Fi", "enabled"])
                     return "WiFi has been turned on."
                 else:
                     # Turn WiFi off using netsh
-                    subprocess.run(["netsh", "interface", "set", "interface", "Wi-Fi", "disabled"], 
-                                  capture_output=True, text=True, check=True)
+                    self._run_command(["netsh", "interface", "set", "interface", "Wi-Fi", "disabled"])
                     return "WiFi has been turned off."
             else:
                 # This is not implemented for non-Windows systems
@@ -129,7 +181,23 @@ class NetworkCommands:
     
     def _show_ip_address(self, command_text, match):
         """Show the user's IP address(es)."""
+        # Addresses rarely change, so reuse a recent answer
+        now = time.monotonic()
+        if self._ip_cache and now - self._ip_cache_time < IP_CACHE_TTL:
+            return self._ip_cache
+        
         try:
+            # Look up the public IP in the background while we get the local
+            # details; the executor isn't waited on, so a slow lookup can't
+            # hold this up past the result timeout. A lookup still running
+            # from an earlier request is waited on instead of starting another.
+            with self._public_ip_lock:
+                if self._public_ip_future is None or self._public_ip_future.done():
+                    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+                    self._public_ip_future = executor.submit(self._get_public_ip)
+                    executor.shutdown(wait=False)
+                public_ip_future = self._public_ip_future
+            
             # Get local IP address
             s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             try:
@@ -145,22 +213,41 @@ class NetworkCommands:
             hostname = socket.gethostname()
             
             # Try to get public IP (this won't work without internet)
-            public_ip = "Could not determine"
+            public_ip = None
             try:
-                import requests
-                response = requests.get('https://api.ipify.org', timeout=3)
-                if response.status_code == 200:
-                    public_ip = response.text
+                public_ip = public_ip_future.result(timeout=3)
             except:
                 pass
             
-            return f"Your local IP address is {local_ip}. Your hostname is {hostname}. Your public IP address is {public_ip}."
+            answer = f"Your local IP address is {local_ip}. Your hostname is {hostname}. Your public IP address is {public_ip or 'Could not determine'}."
+            
+            # Only reuse complete answers, so a failed lookup is retried next time
+            if public_ip:
+                self._ip_cache = answer
+                self._ip_cache_time = now
+            return answer
             
         except Exception as e:
             return f"I couldn't show your IP address. Error: {str(e)}"
     
+    def _get_public_ip(self):
+        """Get the public IP address, or None if it can't be determined."""
+        import requests
+        
+        # Reuse one HTTP session across lookups
+        if self._session is None:
+            self._session = requests.Session()
+        
+        response = self._session.get('https://api.ipify.org', timeout=3)
+        if response.status_code == 200:
+            return response.text
+        return None
+    
     def _manage_network_connection(self, command_text, match):
         """Connect to or disconnect from a network."""
+        # The addresses may change once the network does
+        self._ip_cache = None
+        
         try:
             # Determine if we're connecting or disconnecting
             is_connect = "connect" in command_text.lower() and not "disconnect" in command_text.lower()
@@ -185,18 +272,16 @@ class NetworkCommands:
                 return "I didn't catch which network you want to connect to. Please specify the network name."
             
             # Remove any punctuation at the end
-            network_name = re.sub(r'[.,;!?]$', '', network_name)
+            network_name = network_name.rstrip(".,;!?")
             
             if os.name == 'nt':  # Windows
                 if is_connect:
                     # Connect to WiFi network
-                    subprocess.run(["netsh", "wlan", "connect", "name=" + network_name], 
-                                  capture_output=True, text=True, check=True)
+                    self._run_command(["netsh", "wlan", "connect", "name=" + network_name])
                     return f"Connected to {network_name}."
                 else:
                     # Disconnect from WiFi network
-                    subprocess.run(["netsh", "wlan", "disconnect"], 
-                                  capture_output=True, text=True, check=True)
+                    self._run_command(["netsh", "wlan", "disconnect"])
                     return f"Disconnected from the current network."
             else:
                 # Not implemented for non-Windows systems
@@ -212,12 +297,10 @@ class NetworkCommands:
         try:
             if os.name == 'nt':  # Windows
                 # Get WiFi status
-                wifi_status = subprocess.run(["netsh", "wlan", "show", "interfaces"], 
-                                           capture_output=True, text=True, check=True)
+                wifi_status = self._run_command(["netsh", "wlan", "show", "interfaces"])
                 
                 # Get network interfaces
-                net_status = subprocess.run(["ipconfig", "/all"], 
-                                          capture_output=True, text=True, check=True)
+                net_status = self._run_command(["ipconfig", "/all"])
                 
                 # Parse the output to extract the relevant information
                 # This would be more complex in a real implementation
@@ -230,4 +313,78 @@ class NetworkCommands:
         except subprocess.CalledProcessError as e:
             return f"I couldn't get network status. Error: {e.stderr}"
         except Exception as e:
-            return f"I couldn't get network status. Error: {str(e)}" 
\ No newline at end of file
+            return f"I couldn't get network status. Error: {str(e)}" 
+    
+    def _run_command(self, args):
+        """
+        Run a command through the persistent PowerShell worker.
+        Returns the command output, or raises subprocess.CalledProcessError
+        if the command fails, or subprocess.TimeoutExpired if it doesn't
+        finish within PS_COMMAND_TIMEOUT.
+        """
+        # Quote each argument as a PowerShell literal string
+        command = "& " + " ".join("'" + arg.replace("'", "''") + "'" for arg in args)
+        
+        with self._ps_lock:
+            if self._ps is None or self._ps.poll() is not None:
+                self._start_worker()
+            
+            # Reset the exit code first, since cmdlets and commands that aren't
+            # found leave it unchanged, and report $? too, which they do set
+            self._ps.stdin.write(f'$LASTEXITCODE = 0; {command}; Write-Output "{PS_END_MARKER} $? $LASTEXITCODE"\n')
+            self._ps.stdin.flush()
+            
+            # Read the output up to the end marker, which carries the result
+            output_lines = []
+            deadline = time.monotonic() + PS_COMMAND_TIMEOUT
+            while True:
+                try:
+                    line = self._ps_output.get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    self._stop_worker()
+                    raise subprocess.TimeoutExpired(args, PS_COMMAND_TIMEOUT)
+                
+                if line is None:
+                    self._stop_worker()
+                    raise RuntimeError("The PowerShell worker exited unexpectedly.")
+                if line.startswith(PS_END_MARKER):
+                    succeeded, _, exit_code = line[len(PS_END_MARKER):].strip().partition(" ")
+                    break
+                output_lines.append(line)
+        
+        output = "".join(output_lines)
+        exit_code = int(exit_code or 0)
+        if succeeded != "True" or exit_code != 0:
+            raise subprocess.CalledProcessError(exit_code or 1, args, output=output, stderr=output)
+        return output
+    
+    def _start_worker(self):
+        """Start the PowerShell worker and the thread that reads its output."""
+        self._ps = subprocess.Popen(
+            ["powershell", "-NoProfile", "-NonInteractive", "-Command", "-"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            text=True
+        )
+        self._ps_output = queue.Queue()
+        reader = threading.Thread(target=self._read_worker_output, args=(self._ps, self._ps_output))
+        reader.daemon = True
+        reader.start()
+    
+    def _read_worker_output(self, process, output):
+        """Queue each output line of a PowerShell worker, then None once it exits."""
+        for line in process.stdout:
+            output.put(line)
+        output.put(None)
+    
+    def _stop_worker(self):
+        """Terminate the PowerShell worker, if it's running."""
+        process, self._ps = self._ps, None
+        if process is not None and process.poll() is None:
+            try:
+                process.kill()
+            except Exception:
+                pass
+    
+    def close(self):
+        """Release the resources held by network commands (the PowerShell worker)."""
+        self._stop_worker()
\ No newline at end of file
@@ -2,10 +2,42 @@
 SearchCommands - Handles commands related to web searches.
 """
 
-import webbrowser
+import re
+import time
 import urllib.parse
-import requests
-from bs4 import BeautifulSoup
+from collections import OrderedDict
+
+# Common search prefixes, combined into one pattern with the longest
+# alternatives first so e.g. "search for" wins over "search"
+SEARCH_PREFIXES = (
+    "search for",
+    "search",
+    "google",
+    "look up",
+    "find information about",
+    "find info on",
+    "find information on",
+    "who is",
+    "what is",
+    "where is",
+    "when is",
+    "why is",
+    "how to"
+)
+SEARCH_PREFIX_PATTERN = re.compile(
+    r"\b(" + "|".join(re.escape(prefix) for prefix in sorted(SEARCH_PREFIXES, key=len, reverse=True)) + r")\b"
+)
+
+# User agent sent with search requests, to mimic a browser
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+# Number of recent search answers to keep, and for how long (in seconds)
+SEARCH_CACHE_SIZE = 128
+SEARCH_CACHE_TTL = 600
+
+# Single CSS selector for every part of the results page we extract:
+# featured snippet, "People also ask" pairs, first result and its snippet
+RESULT_ELEMENTS_CSS = '.kp-header, .related-question-pair, .g .yuRUbf, .g .IsZvec'
 
 class SearchCommands:
     """
@@ -16,6 +48,13 @@ class SearchCommands:
         """Initialize the search commands handler."""
         self.assistant = assistant
         
+        # HTTP session reused across searches to keep the connection alive,
+        # created on first use
+        self._session = None
+        
+        # Recent search answers by normalized query: (timestamp, answer)
+        self._search_cache = OrderedDict()
+        
     def process(self, command_text, match=None):
         """
         Process search-related commands.
@@ -39,41 +78,19 @@ class SearchCommands:
     
     def _extract_search_query(self, command_text):
         """Extract the search query from the command text."""
-        # List of common search prefixes
-        search_prefixes = [
-            "search for",
-            "search",
-            "google",
-            "look up",
-            "find information about",
-            "find info on",
-            "find information on",
-            "who is",
-            "what is",
-            "where is",
-            "when is",
-            "why is",
-            "how to"
-        ]
-        
         command_lower = command_text.lower()
         
-        # Try each prefix and see if it's in the command
-        for prefix in search_prefixes:
-            if prefix in command_lower:
-                # Extract everything after the prefix
-                query_parts = command_lower.split(prefix, 1)
-                if len(query_parts) > 1 and query_parts[1].strip():
-                    return query_parts[1].strip()
-        
-        # If no specific prefix is found, but the command seems like a search query
-        # (e.g., "nova, prime minister of india")
-        if "who" in command_lower or "what" in command_lower or "where" in command_lower or \
-           "when" in command_lower or "why" in command_lower or "how" in command_lower:
-            return command_lower
-        
-        # If still no match, and it doesn't look like any other type of command,
-        # assume the entire text after the wake word is the search query
+        # Find the first search prefix in the command
+        match = SEARCH_PREFIX_PATTERN.search(command_lower)
+        if match:
+            # Extract everything after the prefix
+            query = command_lower[match.end():].strip()
+            if query:
+                return query
+        
+        # If no specific prefix is found, the command may still be a search query
+        # (e.g., "nova, prime minister of india"), so use the entire text after
+        # the wake word as the search query
         return command_lower
     
     def open_browser_search(self, query):
@@ -85,6 +102,7 @@ class SearchCommands:
         search_url = f"https://www.google.com/search?q={encoded_query}"
         
         # Open the URL in the default browser
+        import webbrowser
         webbrowser.open(search_url)
         
         return True
@@ -94,59 +112,98 @@ class SearchCommands:
         Perform a Google search and try to extract a direct answer.
         Returns a string with the answer or None if no direct answer is found.
         """
+        # Reuse a recent answer for the same query
+        cache_key = query.strip().lower()
+        cached = self._search_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < SEARCH_CACHE_TTL:
+            self._search_cache.move_to_end(cache_key)
+            return cached[1]
+        
         try:
-            # URL encode the query
-            encoded_query = urllib.parse.quote_plus(query)
+            answer = self._fetch_answer(query)
+        except Exception as e:
+            print(f"Error in search_google: {str(e)}")
+            return None
+        
+        # Remember the answer, evicting the least recently used query if full
+        self._search_cache[cache_key] = (time.monotonic(), answer)
+        self._search_cache.move_to_end(cache_key)
+        if len(self._search_cache) > SEARCH_CACHE_SIZE:
+            self._search_cache.popitem(last=False)
+        
+        return answer
+    
+    def _fetch_answer(self, query):
+        """
+        Fetch the Google results page for a query and extract a direct answer.
+        Returns a string with the answer or None if no direct answer is found.
+        """
+        # URL encode the query
+        encoded_query = urllib.parse.quote_plus(query)
+        
+        # Create the search URL
+        search_url = f"https://www.google.com/search?q={encoded_query}"
+        
+        # Send the request
+        response = self._get_session().get(search_url, timeout=5)
+        
+        # Raise on error responses so they aren't cached as "no answer"
+        response.raise_for_status()
+        
+        # Check if the request was successful
+        if response.status_code == 200:
+            # Parse the HTML content into selectolax's native tree (imported on
+            # first use, so it doesn't slow down startup)
+            from selectolax.parser import HTMLParser
+            tree = HTMLParser(response.text)
             
-            # Create the search URL
-            search_url = f"https://www.google.com/search?q={encoded_query}"
+            # Collect the first element of each kind from a single selector
+            # query, stopping early if the featured snippet turns up
+            featured_snippet = paa_question = first_result = snippet_element = None
+            for element in tree.css(RESULT_ELEMENTS_CSS):
+                classes = (element.attributes.get('class') or '').split()
+                if 'kp-header' in classes:
+                    featured_snippet = element
+                    break
+                elif 'related-question-pair' in classes:
+                    paa_question = paa_question or element
+                elif 'yuRUbf' in classes:
+                    first_result = first_result or element
+                elif 'IsZvec' in classes:
+                    snippet_element = snippet_element or element
             
-            # Set a user agent to mimic a browser
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            }
+            # Try to extract the Google Featured Snippet (direct answer)
+            # This is just a simple example; actual implementation might need more sophistication
+            if featured_snippet:
+                answer = featured_snippet.text().strip()
+                return f"According to Google: {answer}"
             
-            # Send the request
-            response = requests.get(search_url, headers=headers, timeout=5)
+            # Try to extract the first "People also ask" question and answer
+            if paa_question:
+                answer_text = paa_question.text().strip()
+                if answer_text:
+                    return f"I found this related information: {answer_text}"
             
-            # Check if the request was successful
-            if response.status_code == 200:
-                # Parse the HTML content
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Try to extract the Google Featured Snippet (direct answer)
-                # This is just a simple example; actual implementation might need more sophistication
-                featured_snippet = soup.select_one('.kp-header')
-                if featured_snippet:
-                    answer = featured_snippet.get_text().strip()
-                    return f"According to Google: {answer}"
+            # If no featured snippet or PAA, try to get the first search result
+            if first_result:
+                title_element = first_result.css_first('h3')
+                link_element = first_result.css_first('a')
                 
-                # Try to extract the "People also ask" questions and answers
-                paa_questions = soup.select('.related-question-pair')
-                if paa_questions and len(paa_questions) > 0:
-                    for question in paa_questions[:1]:  # Just get the first one
-                        answer_text = question.get_text().strip()
-                        if answer_text:
-                            return f"I found this related information: {answer_text}"
-                
-                # If no featured snippet or PAA, try to get the first search result
-                first_result = soup.select_one('.g .yuRUbf')
-                if first_result:
-                    title_element = first_result.select_one('h3')
-                    link_element = first_result.select_one('a')
-                    snippet_element = soup.select_one('.g .IsZvec')
+                if title_element and link_element and snippet_element:
+                    title = title_element.text().strip()
+                    link = link_element.attributes.get('href', '')
+                    snippet = snippet_element.text().strip()
                     
-                    if title_element and link_element and snippet_element:
-                        title = title_element.get_text().strip()
-                        link = link_element.get('href', '')
-                        snippet = snippet_element.get_text().strip()
-                        
-                        return f"Here's what I found: {title}\n{snippet}\n\nI've opened the web page for more information."
-            
-            # If we couldn't extract a direct answer, return None
-            # This will cause the function caller to open a browser search instead
-            return None
-                
-        except Exception as e:
-            print(f"Error in search_google: {str(e)}")
-            return None 
\ No newline at end of file
+                    return f"Here's what I found: {title}\n{snippet}\n\nI've opened the web page for more information."
+        
+        # If we couldn't extract a direct answer, return None
+        # This will cause the function caller to open a browser search instead
+        return None
+    
+    def _get_session(self):
+        """Get the HTTP session for searches, creating it on first use."""
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+            self._session.headers.update({"User-Agent": USER_AGENT})
+        return self._session
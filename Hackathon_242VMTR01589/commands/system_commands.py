@@ -3,12 +3,54 @@ SystemCommands - Handles commands related to system operations like shutdown, re
 """
 
 import os
-import subprocess
 import re
 import ctypes
-import time
 import platform
-import sys
+
+# Use Google RE2 for linear-time command matching when it is installed
+try:
+    import re2 as re_engine
+except ImportError:
+    re_engine = re
+
+# Pattern for time delays in lowercased text like "5 minutes", and the length of each unit in seconds
+TIME_DELAY_PATTERN = re_engine.compile(r"(\d+)\s+(second|minute|hour)")
+TIME_UNIT_SECONDS = {"second": 1, "minute": 60, "hour": 3600}
+
+# Command names (handled by "_" + name) and their patterns, in precedence order
+COMMAND_PATTERN_SOURCES = (
+    ("shutdown", r"(?:shutdown|turn off)\s+(?:computer|pc|system)"),
+    ("restart", r"restart\s+(?:computer|pc|system)"),
+    ("logout", r"log\s?out"),
+    ("lock", r"lock\s+(?:computer|pc|system)"),
+    ("sleep", r"sleep\s+(?:computer|pc|system)"),
+    ("hibernate", r"hibernate\s+(?:computer|pc|system)")
+)
+
+# Command patterns combined into one regex, compiled once per process; the
+# name of the group that matched is the command
+COMMAND_PATTERN = re_engine.compile("(?i)" + "|".join(
+    f"(?P<{name}>{pattern})" for name, pattern in COMMAND_PATTERN_SOURCES
+))
+
+# Each command pattern on its own, to settle precedence when a text holds
+# more than one command
+COMMAND_PATTERNS = tuple((name, re_engine.compile("(?i)" + pattern))
+                         for name, pattern in COMMAND_PATTERN_SOURCES)
+
+# Keywords that identify a command when no pattern matches, found with a
+# single scan, and the names of their handler methods
+KEYWORD_PATTERN = re_engine.compile(r"\b(turn off|shutdown|restart|log out|logout|lock|sleep|hibernate)\b")
+KEYWORD_HANDLERS = {
+    "turn off": "_shutdown",
+    "shutdown": "_shutdown",
+    "restart": "_restart",
+    "log out": "_logout",
+    "logout": "_logout",
+    "lock": "_lock",
+    "sleep": "_sleep",
+    "hibernate": "_hibernate"
+}
 
 class SystemCommands:
     """
@@ -19,56 +61,51 @@ class SystemCommands:
         """Initialize the system commands handler."""
         self.assistant = assistant
         
-        # Command patterns and their handlers
-        self.command_patterns = {
-            r"(shutdown|turn off)\s+(computer|pc|system)": self._shutdown,
-            r"restart\s+(computer|pc|system)": self._restart,
-            r"log\s?out": self._logout,
-            r"lock\s+(computer|pc|system)": self._lock,
-            r"sleep\s+(computer|pc|system)": self._sleep,
-            r"hibernate\s+(computer|pc|system)": self._hibernate
-        }
+        # Handlers for each named group of the command pattern
+        self.command_handlers = {name: getattr(self, "_" + name)
+                                 for name in COMMAND_PATTERN.groupindex}
     
-    def process(self, command_text, match=None):
+    def process(self, command_text, match=None, handler=None):
         """
         Process system-related commands.
+        If the caller already resolved the handler, it is called directly.
         Returns a response string.
         """
         command_lower = command_text.lower()
         
         # If match is provided, use it to determine the command
-        if match:
-            for pattern, handler in self.command_patterns.items():
-                if re.match(pattern, match.group(0), re.IGNORECASE):
-                    return handler(command_text)
+        if handler is None and match:
+            handler = self.match_handler(match.group(0))
         
-        # Otherwise, try to match the command
-        for pattern, handler in self.command_patterns.items():
-            if re.search(pattern, command_lower, re.IGNORECASE):
-                return handler(command_text)
+        if handler:
+            return handler(command_text, command_lower)
+        
+        # Otherwise, try to match the command. The combined pattern rules out
+        # text without a command in one scan, but it finds the leftmost
+        # command; the first command in precedence order found anywhere in the
+        # text wins ("restart pc, then shutdown pc" is a shutdown)
+        if COMMAND_PATTERN.search(command_lower):
+            name = next(name for name, pattern in COMMAND_PATTERNS if pattern.search(command_lower))
+            return self.command_handlers[name](command_text, command_lower)
         
         # Check for specific keywords if no pattern matches
-        if "shutdown" in command_lower or "turn off" in command_lower:
-            return self._shutdown(command_text)
-        elif "restart" in command_lower:
-            return self._restart(command_text)
-        elif "logout" in command_lower or "log out" in command_lower:
-            return self._logout(command_text)
-        elif "lock" in command_lower:
-            return self._lock(command_text)
-        elif "sleep" in command_lower:
-            return self._sleep(command_text)
-        elif "hibernate" in command_lower:
-            return self._hibernate(command_text)
+        keyword_match = KEYWORD_PATTERN.search(command_lower)
+        if keyword_match:
+            return getattr(self, KEYWORD_HANDLERS[keyword_match.group(1)])(command_text, command_lower)
         
         # If no command is recognized
         return "I'm not sure which system command you want to execute. " \
                "Try saying 'shutdown', 'restart', 'lock', 'sleep', 'hibernate', or 'log out'."
     
-    def _shutdown(self, command_text):
+    def match_handler(self, text):
+        """Return the handler whose pattern matches the start of text, or None."""
+        command_match = COMMAND_PATTERN.match(text)
+        return self.command_handlers[command_match.lastgroup] if command_match else None
+    
+    def _shutdown(self, command_text, command_lower=None):
         """Shutdown the computer."""
         # Check for time specification
-        delay = self._extract_time_delay(command_text)
+        delay = self._extract_time_delay(command_lower or command_text.lower())
         
         try:
             # Get confirmation before shutdown
@@ -89,10 +126,10 @@ class SystemCommands:
         except Exception as e:
             return f"I couldn't shutdown your computer. Error: {str(e)}"
     
-    def _restart(self, command_text):
+    def _restart(self, command_text, command_lower=None):
         """Restart the computer."""
         # Check for time specification
-        delay = self._extract_time_delay(command_text)
+        delay = self._extract_time_delay(command_lower or command_text.lower())
         
         try:
             # Get confirmation before restart
@@ -113,7 +150,7 @@ class SystemCommands:
         except Exception as e:
             return f"I couldn't restart your computer. Error: {str(e)}"
     
-    def _logout(self, command_text):
+    def _logout(self, command_text, command_lower=None):
         """Log out the current user."""
         try:
             # Get confirmation before logout
@@ -134,7 +171,7 @@ class SystemCommands:
         except Exception as e:
             return f"I couldn't log you out. Error: {str(e)}"
     
-    def _lock(self, command_text):
+    def _lock(self, command_text, command_lower=None):
         """Lock the computer."""
         try:
             if os.name == 'nt':  # Windows
@@ -151,7 +188,7 @@ class SystemCommands:
         except Exception as e:
             return f"I couldn't lock your computer. Error: {str(e)}"
     
-    def _sleep(self, command_text):
+    def _sleep(self, command_text, command_lower=None):
         """Put the computer to sleep."""
         try:
             # Get confirmation before sleep
@@ -174,7 +211,7 @@ class SystemCommands:
         except Exception as e:
             return f"I couldn't put your computer to sleep. Error: {str(e)}"
     
-    def _hibernate(self, command_text):
+    def _hibernate(self, command_text, command_lower=None):
         """Hibernate the computer."""
         try:
             # Get confirmation before hibernate
@@ -198,25 +235,12 @@ class SystemCommands:
         except Exception as e:
             return f"I couldn't hibernate your computer. Error: {str(e)}"
     
-    def _extract_time_delay(self, command_text):
-        """Extract time delay from command text, in seconds."""
+    def _extract_time_delay(self, command_lower):
+        """Extract time delay from lowercased command text, in seconds."""
         # Look for time specifications like "in 5 minutes" or "after 10 seconds"
-        command_lower = command_text.lower()
-        
-        # Check for seconds
-        seconds_match = re.search(r"(\d+)\s+second", command_lower)
-        if seconds_match:
-            return int(seconds_match.group(1))
-        
-        # Check for minutes
-        minutes_match = re.search(r"(\d+)\s+minute", command_lower)
-        if minutes_match:
-            return int(minutes_match.group(1)) * 60
-        
-        # Check for hours
-        hours_match = re.search(r"(\d+)\s+hour", command_lower)
-        if hours_match:
-            return int(hours_match.group(1)) * 3600
+        match = TIME_DELAY_PATTERN.search(command_lower)
+        if match:
+            return int(match.group(1)) * TIME_UNIT_SECONDS[match.group(2)]
         
         # Default delay (0 for immediate action)
-        return 0 
\ No newline at end of file
+        return 0
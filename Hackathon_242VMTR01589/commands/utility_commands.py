@@ -5,8 +5,86 @@ UtilityCommands - Handles commands related to system utilities like Control Pane
 import os
 import subprocess
 import re
-import sys
-import psutil
+import heapq
+
+# Use Google RE2 for linear-time command matching when it is installed
+try:
+    import re2 as re_engine
+except ImportError:
+    re_engine = re
+
+# Command patterns and the names of their handler methods, compiled once per process
+COMMAND_PATTERNS = tuple(
+    (re_engine.compile("(?i)" + pattern), handler_name)
+    for pattern, handler_name in (
+        (r"open\s+control\s*panel", "_open_control_panel"),
+        (r"open\s+task\s*manager", "_open_task_manager"),
+        (r"open\s+file\s*explorer", "_open_file_explorer"),
+        (r"(show|list)\s+running\s*processes", "_list_processes"),
+        (r"(show|display)\s+cpu\s*usage", "_show_cpu_usage"),
+        (r"(show|display)\s+memory\s*usage", "_show_memory_usage"),
+        (r"(set|adjust)\s+volume\s+(to|up|down|mute)", "_adjust_volume")
+    )
+)
+
+# Utility mappings
+UTILITY_MAPPINGS = {
+    "control panel": {
+        "command": "control",
+        "description": "Control Panel"
+    },
+    "task manager": {
+        "command": "taskmgr",
+        "description": "Task Manager"
+    },
+    "file explorer": {
+        "command": "explorer",
+        "description": "File Explorer"
+    },
+    "settings": {
+        "command": "ms-settings:",
+        "description": "Windows Settings"
+    },
+    "device manager": {
+        "command": "devmgmt.msc",
+        "description": "Device Manager"
+    },
+    "disk management": {
+        "command": "diskmgmt.msc",
+        "description": "Disk Management"
+    },
+    "command prompt": {
+        "command": "cmd",
+        "description": "Command Prompt"
+    },
+    "powershell": {
+        "command": "powershell",
+        "description": "PowerShell"
+    }
+}
+
+# Handler method names for keywords that identify a command when no pattern
+# matches, and the words that must accompany some of them
+KEYWORD_HANDLERS = {
+    "control panel": "_open_control_panel",
+    "task manager": "_open_task_manager",
+    "file explorer": "_open_file_explorer",
+    "processes": "_list_processes",
+    "cpu": "_show_cpu_usage",
+    "memory": "_show_memory_usage",
+    "volume": "_adjust_volume"
+}
+KEYWORD_QUALIFIERS = {
+    "cpu": ("usage", "load"),
+    "memory": ("usage", "load")
+}
+
+# Single alternation of all utility names and keywords, longest first,
+# so one scan of the command finds every keyword in it
+KEYWORD_PATTERN = re_engine.compile(
+    "|".join(re.escape(keyword)
+             for keyword in sorted(set(UTILITY_MAPPINGS) | set(KEYWORD_HANDLERS), key=len, reverse=True))
+)
 
 class UtilityCommands:
     """
@@ -17,97 +95,59 @@ class UtilityCommands:
         """Initialize the utility commands handler."""
         self.assistant = assistant
         
-        # Command patterns and their handlers
-        self.command_patterns = {
-            r"open\s+control\s*panel": self._open_control_panel,
-            r"open\s+task\s*manager": self._open_task_manager,
-            r"open\s+file\s*explorer": self._open_file_explorer,
-            r"(show|list)\s+running\s*processes": self._list_processes,
-            r"(show|display)\s+cpu\s*usage": self._show_cpu_usage,
-            r"(show|display)\s+memory\s*usage": self._show_memory_usage,
-            r"(set|adjust)\s+volume\s+(to|up|down|mute)": self._adjust_volume
-        }
+        # Command patterns and keyword handlers bound to this instance
+        self.command_patterns = [(pattern, getattr(self, handler_name))
+                                 for pattern, handler_name in COMMAND_PATTERNS]
+        self.keyword_handlers = {keyword: getattr(self, handler_name)
+                                 for keyword, handler_name in KEYWORD_HANDLERS.items()}
         
         # Utility mappings
-        self.utility_mappings = {
-            "control panel": {
-                "command": "control",
-                "description": "Control Panel"
-            },
-            "task manager": {
-                "command": "taskmgr",
-                "description": "Task Manager"
-            },
-            "file explorer": {
-                "command": "explorer",
-                "description": "File Explorer"
-            },
-            "settings": {
-                "command": "ms-settings:",
-                "description": "Windows Settings"
-            },
-            "device manager": {
-                "command": "devmgmt.msc",
-                "description": "Device Manager"
-            },
-            "disk management": {
-                "command": "diskmgmt.msc",
-                "description": "Disk Management"
-            },
-            "command prompt": {
-                "command": "cmd",
-                "description": "Command Prompt"
-            },
-            "powershell": {
-                "command": "powershell",
-                "description": "PowerShell"
-            }
-        }
+        self.utility_mappings = UTILITY_MAPPINGS
     
-    def process(self, command_text, match=None):
+    def process(self, command_text, match=None, handler=None):
         """
         Process utility-related commands.
+        If the caller already resolved the handler, it is called directly.
         Returns a response string.
         """
         command_lower = command_text.lower()
         
         # If match is provided, use it to determine the command
-        if match:
-            for pattern, handler in self.command_patterns.items():
-                if re.match(pattern, match.group(0), re.IGNORECASE):
-                    return handler(command_text)
+        if handler is None and match:
+            handler = self.match_handler(match.group(0))
         
-        # Otherwise, try to match the command
-        for pattern, handler in self.command_patterns.items():
-            if re.search(pattern, command_lower, re.IGNORECASE):
-                return handler(command_text)
+        if handler:
+            return handler(command_text, command_lower)
         
-        # Check for utility keywords
-        for utility_name, utility_info in self.utility_mappings.items():
-            if utility_name in command_lower:
-                if "open" in command_lower:
-                    return self._open_utility(utility_info["command"], utility_info["description"])
+        # Otherwise, try to match the command
+        for pattern, handler in self.command_patterns:
+            if pattern.search(command_lower):
+                return handler(command_text, command_lower)
         
-        # Check for specific keywords if no pattern matches
-        if "control panel" in command_lower:
-            return self._open_control_panel(command_text)
-        elif "task manager" in command_lower:
-            return self._open_task_manager(command_text)
-        elif "file explorer" in command_lower:
-            return self._open_file_explorer(command_text)
-        elif "processes" in command_lower:
-            return self._list_processes(command_text)
-        elif "cpu" in command_lower and ("usage" in command_lower or "load" in command_lower):
-            return self._show_cpu_usage(command_text)
-        elif "memory" in command_lower and ("usage" in command_lower or "load" in command_lower):
-            return self._show_memory_usage(command_text)
-        elif "volume" in command_lower:
-            return self._adjust_volume(command_text)
+        # Check for utility keywords, in the order they appear in the command
+        for keyword_match in KEYWORD_PATTERN.finditer(command_lower):
+            keyword = keyword_match.group(0)
+            
+            if keyword in self.utility_mappings and "open" in command_lower:
+                utility_info = self.utility_mappings[keyword]
+                return self._open_utility(utility_info["command"], utility_info["description"])
+            
+            handler = self.keyword_handlers.get(keyword)
+            qualifiers = KEYWORD_QUALIFIERS.get(keyword)
+            if handler and (not qualifiers or any(word in command_lower for word in qualifiers)):
+                return handler(command_text, command_lower)
         
         # If no command is recognized
         return "I'm not sure which utility command you want to execute. " \
                "Try saying 'open Control Panel', 'open Task Manager', or 'show CPU usage'."
     
+    def match_handler(self, text):
+        """Return the handler whose pattern matches the start of text, or None."""
+        for pattern, handler in self.command_patterns:
+            if pattern.match(text):
+                return handler
+        return None
+    
     def _open_utility(self, command, description):
         """Open a utility using the specified command."""
         try:
@@ -116,25 +156,27 @@ class UtilityCommands:
         except Exception as e:
             return f"I couldn't open {description}. Error: {str(e)}"
     
-    def _open_control_panel(self, command_text):
+    def _open_control_panel(self, command_text, command_lower=None):
         """Open the Control Panel."""
         return self._open_utility("control", "Control Panel")
     
-    def _open_task_manager(self, command_text):
+    def _open_task_manager(self, command_text, command_lower=None):
         """Open the Task Manager."""
         return self._open_utility("taskmgr", "Task Manager")
     
-    def _open_file_explorer(self, command_text):
+    def _open_file_explorer(self, command_text, command_lower=None):
         """Open File Explorer."""
         return self._open_utility("explorer", "File Explorer")
     
-    def _list_processes(self, command_text):
+    def _list_processes(self, command_text, command_lower=None):
         """List running processes."""
         try:
+            import psutil
+            
             # Get the top processes by CPU usage
             processes = []
-            for proc in sorted(psutil.process_iter(['pid', 'name', 'cpu_percent']), 
-                              key=lambda p: p.info['cpu_percent'] or 0, reverse=True)[:10]:
+            for proc in heapq.nlargest(10, psutil.process_iter(['pid', 'name', 'cpu_percent']), 
+                                       key=lambda p: p.info['cpu_percent'] or 0):
                 try:
                     processes.append(f"{proc.info['name']} (PID: {proc.info['pid']}, CPU: {proc.info['cpu_percent']}%)")
                 except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
@@ -149,15 +191,17 @@ class UtilityCommands:
         except Exception as e:
             return f"I couldn't list the processes. Error: {str(e)}"
     
-    def _show_cpu_usage(self, command_text):
+    def _show_cpu_usage(self, command_text, command_lower=None):
         """Show CPU usage."""
         try:
-            # Get overall CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
+            import psutil
             
-            # Get per-core usage
+            # Get per-core usage, sampled over one second
             per_cpu = psutil.cpu_percent(interval=1, percpu=True)
             
+            # Overall usage is the average across cores
+            cpu_percent = round(sum(per_cpu) / len(per_cpu), 1)
+            
             # Format response
             response = f"Current CPU usage is {cpu_percent}% overall. "
             response += "Per-core usage: " + ", ".join([f"Core {i}: {usage}%" for i, usage in enumerate(per_cpu)])
@@ -167,9 +211,11 @@ class UtilityCommands:
         except Exception as e:
             return f"I couldn't retrieve CPU usage. Error: {str(e)}"
     
-    def _show_memory_usage(self, command_text):
+    def _show_memory_usage(self, command_text, command_lower=None):
         """Show memory usage."""
         try:
+            import psutil
+            
             # Get memory usage
             mem = psutil.virtual_memory()
             
@@ -186,33 +232,34 @@ class UtilityCommands:
         except Exception as e:
             return f"I couldn't retrieve memory usage. Error: {str(e)}"
     
-    def _adjust_volume(self, command_text):
+    def _adjust_volume(self, command_text, command_lower=None):
         """Adjust system volume."""
         try:
             # Determine the volume action
-            command_lower = command_text.lower()
+            if command_lower is None:
+                command_lower = command_text.lower()
             
             if "mute" in command_lower:
                 # Mute volume
                 if os.name == 'nt':  # Windows
-                    subprocess.run(["powershell", "-c", "(New-Object -ComObject WScript.Shell).SendKeys([char]173)"], 
-                                  check=True, capture_output=True)
+                    subprocess.run(["powershell", "-NoProfile", "-c", "(New-Object -ComObject WScript.Shell).SendKeys([char]173)"], 
+                                  check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
                     return "I've muted the volume."
             elif "up" in command_lower:
                 # Increase volume
                 if os.name == 'nt':  # Windows
-                    # Increase volume multiple times for a more noticeable effect
-                    for _ in range(5):
-                        subprocess.run(["powershell", "-c", "(New-Object -ComObject WScript.Shell).SendKeys([char]175)"], 
-                                      check=True, capture_output=True)
+                    # Increase volume multiple times for a more noticeable effect,
+                    # sending all key presses from a single PowerShell process
+                    subprocess.run(["powershell", "-NoProfile", "-c", "$shell = New-Object -ComObject WScript.Shell; 1..5 | ForEach-Object { $shell.SendKeys([char]175) }"], 
+                                  check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
                     return "I've increased the volume."
             elif "down" in command_lower:
                 # Decrease volume
                 if os.name == 'nt':  # Windows
-                    # Decrease volume multiple times for a more noticeable effect
-                    for _ in range(5):
-                        subprocess.run(["powershell", "-c", "(New-Object -ComObject WScript.Shell).SendKeys([char]174)"], 
-                                      check=True, capture_output=True)
+                    # Decrease volume multiple times for a more noticeable effect,
+                    # sending all key presses from a single PowerShell process
+                    subprocess.run(["powershell", "-NoProfile", "-c", "$shell = New-Object -ComObject WScript.Shell; 1..5 | ForEach-Object { $shell.SendKeys([char]174) }"], 
+                                  check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
                     return "I've decreased the volume."
             elif "to" in command_lower:
                 # Try to set volume to a specific level (requires additional parsing)
@@ -222,5 +269,7 @@ class UtilityCommands:
             # If no specific action is recognized
             return "I'm not sure how you want me to adjust the volume. Try saying 'volume up', 'volume down', or 'mute'."
             
+        except subprocess.CalledProcessError as e:
+            return f"I couldn't adjust the volume. Error: {e.stderr.decode(errors='replace')}"
         except Exception as e:
             return f"I couldn't adjust the volume. Error: {str(e)}" 
\ No newline at end of file
@@ -8,8 +8,6 @@ Main entry point for the application
 
 import sys
 import os
-import time
-from pathlib import Path
 from dotenv import load_dotenv
 
 # Ensure we can import from our package
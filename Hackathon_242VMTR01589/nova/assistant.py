@@ -10,15 +10,16 @@ import threading
 import queue
 import json
 import random
+from collections import deque
 from datetime import datetime
 
-import speech_recognition as sr
-import pyttsx3
-
 from nova.voice_recognition import VoiceRecognizer
 from nova.command_processor import CommandProcessor
 from nova.response_generator import ResponseGenerator
 
+# File that remembers the chosen voice, so later startups skip enumerating voices
+VOICE_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".nova", "voice.json")
+
 class NovaAssistant:
     """
     Main assistant class that coordinates all Nova functionality.
@@ -26,15 +27,13 @@ class NovaAssistant:
     
     def __init__(self):
         """Initialize the Nova assistant with all required components."""
-        # Initialize the text-to-speech engine
+        # Initialize the text-to-speech engine (imported here, since pyttsx3
+        # is slow to import and only needed once the assistant is created)
+        import pyttsx3
         self.engine = pyttsx3.init()
         
         # Set voice properties
-        voices = self.engine.getProperty('voices')
-        # Try to find a female voice
-        female_voice = next((voice for voice in voices if 'female' in voice.name.lower()), None)
-        if female_voice:
-            self.engine.setProperty('voice', female_voice.id)
+        self._select_voice()
         
         # Set speech rate and volume
         self.engine.setProperty('rate', 180)  # Speed of speech
@@ -51,9 +50,6 @@ class NovaAssistant:
         self.is_speaking = False
         self.wake_word_detected = False
         
-        # Command queue for processing
-        self.command_queue = queue.Queue()
-        
         # Greeting messages
         self.greetings = [
             "Hello! I'm Nova, your virtual assistant.",
@@ -72,17 +68,64 @@ class NovaAssistant:
             "I'm here"
         ]
         
+        # Shuffled copies of the messages above, used up before reshuffling
+        # so every message is heard before any repeats
+        self.greeting_order = deque()
+        self.wake_word_response_order = deque()
+        
         # Wake word
         self.wake_word = "nova"
         
         # Start listening thread
         self.listening_thread = None
         self.stop_listening = threading.Event()
+        
+        # Single speech thread that speaks queued text in order
+        self.speech_queue = queue.Queue()
+        
+        # Guards is_speaking against text being queued as the speech thread goes idle
+        self.speech_lock = threading.Lock()
+        
+        self.speech_thread = threading.Thread(target=self._speech_worker)
+        self.speech_thread.daemon = True
+        self.speech_thread.start()
+    
+    def _select_voice(self):
+        """Use the cached voice if it is still installed, otherwise find a female voice and cache it."""
+        # Try the voice chosen on a previous run (pyttsx3 ignores unknown
+        # voice ids, so read the voice back to check it was applied)
+        try:
+            with open(VOICE_CACHE_PATH) as f:
+                voice_id = json.load(f)['voice_id']
+            self.engine.setProperty('voice', voice_id)
+            if self.engine.getProperty('voice') == voice_id:
+                return
+        except Exception:
+            pass
+        
+        voices = self.engine.getProperty('voices')
+        # Try to find a female voice
+        female_voice = next((voice for voice in voices if 'female' in voice.name.lower()), None)
+        if female_voice:
+            self.engine.setProperty('voice', female_voice.id)
+            
+            # Remember the voice for next time
+            try:
+                os.makedirs(os.path.dirname(VOICE_CACHE_PATH), exist_ok=True)
+                with open(VOICE_CACHE_PATH, 'w') as f:
+                    json.dump({'voice_id': female_voice.id}, f)
+            except OSError as e:
+                print(f"Error caching voice: {e}")
     
     def start(self):
         """Start the assistant services."""
         if self.listening_thread is None or not self.listening_thread.is_alive():
             self.stop_listening.clear()
+            
+            # Record phrases in the background, so recognizing one phrase
+            # doesn't stop the next from being heard
+            self.recognizer.start_background_listening()
+            
             self.listening_thread = threading.Thread(target=self.listen_continuously)
             self.listening_thread.daemon = True
             self.listening_thread.start()
@@ -91,8 +134,16 @@ class NovaAssistant:
         """Stop the assistant services."""
         if self.listening_thread and self.listening_thread.is_alive():
             self.stop_listening.set()
+            self.recognizer.stop_background_listening()
             self.listening_thread.join(timeout=2.0)
     
+    def shutdown(self):
+        """Stop the assistant services, the speech thread, the microphone and command helpers."""
+        self.stop()
+        self.recognizer.close_microphone()
+        self.command_processor.close()
+        self.speech_queue.put(None)
+    
     def listen_continuously(self):
         """Listen continuously for the wake word followed by commands."""
         while not self.stop_listening.is_set():
@@ -100,8 +151,9 @@ class NovaAssistant:
                 # Listen for the wake word
                 print("Listening for wake word...")
                 
-                # Try to detect wake word and command in the same utterance
-                command = self.recognizer.detect_wake_word_and_command()
+                # Recognize one utterance, which may hold both the wake word
+                # and the command
+                wake_word_detected, command = self.recognizer.detect_wake_word_and_command()
                 
                 if command and not self.stop_listening.is_set():
                     # If we got both wake word and command, process it directly
@@ -109,9 +161,7 @@ class NovaAssistant:
                     self.process_command(command)
                     continue
                 
-                # Otherwise, listen for wake word only
-                wake_word_detected = self.recognizer.detect_wake_word()
-                
+                # If only the wake word was heard, listen for the command
                 if wake_word_detected and not self.stop_listening.is_set():
                     # Wake word was detected, now listen for the command
                     self.is_listening = True
@@ -120,10 +170,8 @@ class NovaAssistant:
                     # Notify UI or any observers
                     self.on_listening_started()
                     
-                    # Provide feedback that we heard the wake word
-                    self.on_wake_word_detected()
-                    
-                    # Listen for the command
+                    # Listen for the command (this also gives feedback that
+                    # we heard the wake word)
                     print("Listening for command...")
                     command = self.recognizer.listen_for_command()
                     
@@ -146,9 +194,6 @@ class NovaAssistant:
         self.on_processing_started()
         
         try:
-            # Queue the command for processing
-            self.command_queue.put(command_text)
-            
             # Process the command
             response = self.command_processor.process(command_text)
             
@@ -169,29 +214,46 @@ class NovaAssistant:
         if not text:
             return
             
-        self.is_speaking = True
-        self.on_speaking_started(text)
-        
-        # Speak in a separate thread to avoid blocking
-        def speak_thread():
+        # Speak on the speech thread to avoid blocking
+        with self.speech_lock:
+            self.is_speaking = True
+            self.speech_queue.put(text)
+    
+    def _speech_worker(self):
+        """Speak queued text until a None sentinel is received."""
+        while True:
+            text = self.speech_queue.get()
+            if text is None:
+                break
+            
+            self.on_speaking_started(text)
             try:
                 self.engine.say(text)
                 self.engine.runAndWait()
             except Exception as e:
                 print(f"Error in speak: {e}")
             finally:
-                self.is_speaking = False
-                self.on_speaking_stopped()
-        
-        threading.Thread(target=speak_thread).start()
+                # Only report stopping once nothing else is waiting to be spoken
+                with self.speech_lock:
+                    finished = self.speech_queue.empty()
+                    if finished:
+                        self.is_speaking = False
+                if finished:
+                    self.on_speaking_stopped()
     
     def get_random_greeting(self):
         """Return a random greeting message."""
-        return random.choice(self.greetings)
+        return self._next_shuffled(self.greeting_order, self.greetings)
     
     def get_random_wake_word_response(self):
         """Return a random wake word acknowledgment."""
-        return random.choice(self.wake_word_responses)
+        return self._next_shuffled(self.wake_word_response_order, self.wake_word_responses)
+    
+    def _next_shuffled(self, order, messages):
+        """Return the next message from a shuffled order, reshuffling when used up."""
+        if not order:
+            order.extend(random.sample(messages, len(messages)))
+        return order.popleft()
     
     def on_wake_word_detected(self):
         """Called when the wake word is detected."""
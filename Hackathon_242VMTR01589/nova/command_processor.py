@@ -3,17 +3,42 @@ CommandProcessor - Parses and routes commands to appropriate handlers.
 """
 
 import re
+import functools
 import importlib
 import os
-from datetime import datetime
+import random
+import string
+from collections import deque
+import time
 import sys
 
-# Import command modules
-from commands.app_commands import AppCommands
-from commands.system_commands import SystemCommands
-from commands.network_commands import NetworkCommands
-from commands.utility_commands import UtilityCommands
-from commands.search_commands import SearchCommands
+# Command modules and handler classes for each category, imported on first use
+COMMAND_HANDLER_CLASSES = {
+    "app": ("commands.app_commands", "AppCommands"),
+    "system": ("commands.system_commands", "SystemCommands"),
+    "network": ("commands.network_commands", "NetworkCommands"),
+    "utility": ("commands.utility_commands", "UtilityCommands"),
+    "search": ("commands.search_commands", "SearchCommands")
+}
+
+# Day and month names for spoken dates, indexed like time.struct_time
+DAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+MONTH_NAMES = ("January", "February", "March", "April", "May", "June", "July",
+               "August", "September", "October", "November", "December")
+
+# Fixed replies to help and identity questions
+HELP_TEXT = ("I can help you with various tasks. Try commands like:\n"
+             "- Open Chrome\n"
+             "- What time is it?\n"
+             "- Shutdown my computer\n"
+             "- Turn off WiFi\n"
+             "- Show my IP address\n"
+             "- Open Task Manager\n"
+             "- Search for the prime minister of India")
+WHO_ARE_YOU_TEXT = "I'm Nova, your personal AI assistant. I'm designed to help you control your computer, open applications, search the web, and provide information through voice commands."
+WHAT_CAN_YOU_DO_TEXT = ("I can help you with various tasks on your computer. I can open applications, "
+                        "control system functions like shutdown or restart, manage network settings, "
+                        "open system utilities, and search the web for information. Just tell me what you need!")
 
 class CommandProcessor:
     """
@@ -24,14 +49,8 @@ class CommandProcessor:
         """Initialize the command processor with command handlers."""
         self.assistant = assistant
         
-        # Initialize command handlers
-        self.command_handlers = {
-            "app": AppCommands(assistant),
-            "system": SystemCommands(assistant),
-            "network": NetworkCommands(assistant),
-            "utility": UtilityCommands(assistant),
-            "search": SearchCommands(assistant)
-        }
+        # Command handlers, created by _get_handler when first needed
+        self.command_handlers = {}
         
         # Built-in commands handled directly by the processor
         self.builtin_commands = {
@@ -50,6 +69,22 @@ class CommandProcessor:
             "stop listening": self.handle_stop_listening
         }
         
+        # Replies to thanks, and a shuffled copy used up before reshuffling
+        self.thank_you_responses = [
+            "You're welcome!",
+            "Happy to help!",
+            "No problem at all!",
+            "Anytime!",
+            "Glad I could assist!"
+        ]
+        self.thank_you_order = deque()
+        
+        # Single alternation of the built-in command keys (longest first), so
+        # one scan of the command finds the first key it contains
+        self.builtin_pattern = re.compile(
+            "|".join(re.escape(key) for key in sorted(self.builtin_commands, key=len, reverse=True))
+        )
+        
         # Command patterns for each category
         self.command_patterns = {
             "app": [
@@ -83,6 +118,36 @@ class CommandProcessor:
                 r"(who|what|where|when|why|how)(\s+is|\s+are|\s+was|\s+were|\s+do|\s+does|\s+did|\s+can|\s+could|\s+would|\s+should|\s+to).*"
             ]
         }
+        
+        # Every pattern with its category as one flat list, compiled once
+        # rather than on every command
+        self.pattern_list = [(category, re.compile(pattern, re.IGNORECASE))
+                             for category, patterns in self.command_patterns.items()
+                             for pattern in patterns]
+        
+        # Union of all the patterns with a named group per pattern ("p" + its
+        # index in pattern_list), so a single search finds the pattern (named
+        # groups inside the patterns become non-capturing, since a group name
+        # can only be used once)
+        self.union_pattern = re.compile("|".join(
+            f"(?P<p{index}>" + re.sub(r"\(\?P<\w+>", "(?:", pattern.pattern) + ")"
+            for index, (category, pattern) in enumerate(self.pattern_list)
+        ), re.IGNORECASE)
+        
+        # Keywords for each category, each compiled into a single alternation,
+        # for commands that match none of the patterns above
+        self.fallback_patterns = {
+            category: re.compile("|".join(re.escape(keyword) for keyword in keywords))
+            for category, keywords in (
+                ("app", ["open", "launch", "start", "run"]),
+                ("system", ["shutdown", "restart", "lock", "sleep", "hibernate", "log out"]),
+                ("network", ["wifi", "wireless", "bluetooth", "ip address", "network"]),
+                ("utility", ["control panel", "task manager", "file explorer", "processes", "volume"])
+            )
+        }
+        
+        # Memoized command classification, keyed by the lowercased command
+        self._classify = functools.lru_cache(maxsize=256)(self._classify_command)
     
     def process(self, command_text):
         """Process a command and return a response."""
@@ -92,57 +157,82 @@ class CommandProcessor:
         # Remove the wake word if present
         command_text = self._remove_wake_word(command_text)
         
+        # Work out who should handle the command (memoized, since users
+        # repeat the same commands), then run the handler
+        builtin_key, category, match, handler = self._classify(command_text.lower())
+        
+        if builtin_key:
+            return self.builtin_commands[builtin_key](command_text)
+        
+        # Route to the appropriate handler, passing along the method that
+        # handles the match when it has already been resolved
+        if handler:
+            return self._get_handler(category).process(command_text, match, handler=handler)
+        return self._get_handler(category).process(command_text, match)
+    
+    def _classify_command(self, command_lower):
+        """
+        Classify a lowercased command.
+        Returns (builtin_key, category, match, handler): the built-in command
+        key, or None and the handler category with its pattern match (if any)
+        and, for handlers that can resolve it, the method for that match.
+        """
         # Try built-in commands first
-        for key, handler in self.builtin_commands.items():
-            if key in command_text.lower():
-                return handler(command_text)
+        builtin_match = self.builtin_pattern.search(command_lower)
+        if builtin_match:
+            return builtin_match.group(0), None, None, None
         
         # Try to categorize the command
-        category, match = self._categorize_command(command_text)
+        category, match = self._categorize_command(command_lower)
         
         if category and match:
-            # Route to the appropriate handler
-            return self.command_handlers[category].process(command_text, match)
+            match_handler = getattr(self._get_handler(category), "match_handler", None)
+            return None, category, match, match_handler(match.group(0)) if match_handler else None
         
         # If we can't categorize, try a more flexible approach
-        if any(app_key in command_text.lower() for app_key in ["open", "launch", "start", "run"]):
-            return self.command_handlers["app"].process(command_text, None)
-            
-        if any(sys_key in command_text.lower() for sys_key in ["shutdown", "restart", "lock", "sleep", "hibernate", "log out"]):
-            return self.command_handlers["system"].process(command_text, None)
-            
-        if any(net_key in command_text.lower() for net_key in ["wifi", "wireless", "bluetooth", "ip address", "network"]):
-            return self.command_handlers["network"].process(command_text, None)
-            
-        if any(util_key in command_text.lower() for util_key in ["control panel", "task manager", "file explorer", "processes", "volume"]):
-            return self.command_handlers["utility"].process(command_text, None)
-        
-        # Check if it might be a search query
-        if any(search_key in command_text.lower() for search_key in ["search", "google", "find", "who", "what", "where", "when", "why", "how"]):
-            return self.command_handlers["search"].process(command_text, None)
-        
-        # If it doesn't match any known command pattern, try treating it as a search query
-        return self.command_handlers["search"].process(command_text, None)
+        for category, pattern in self.fallback_patterns.items():
+            if pattern.search(command_lower):
+                return None, category, None, None
+        
+        # Anything else, whether or not it looks like a question, is treated
+        # as a search query
+        return None, "search", None, None
+    
+    def _get_handler(self, category):
+        """Return the handler for a category, importing and creating it on first use."""
+        handler = self.command_handlers.get(category)
+        if handler is None:
+            module_name, class_name = COMMAND_HANDLER_CLASSES[category]
+            handler_class = getattr(importlib.import_module(module_name), class_name)
+            handler = self.command_handlers[category] = handler_class(self.assistant)
+        return handler
+    
+    def close(self):
+        """Release resources held by the command handlers created so far."""
+        for handler in self.command_handlers.values():
+            close = getattr(handler, "close", None)
+            if close:
+                close()
     
     def _remove_wake_word(self, command_text):
         """Remove the wake word from the beginning of the command."""
         wake_word = self.assistant.wake_word.lower()
         if command_text.lower().startswith(wake_word):
-            return re.sub(f"^{wake_word}[,\\s]*", "", command_text, flags=re.IGNORECASE).strip()
+            # Drop the wake word and any commas or spaces after it
+            return command_text[len(wake_word):].lstrip("," + string.whitespace).rstrip()
         return command_text
     
-    def _categorize_command(self, command_text):
+    def _categorize_command(self, command_lower):
         """
-        Categorize a command based on patterns.
+        Categorize a lowercased command based on patterns.
         Returns the category and the match object, or (None, None) if no match.
         """
-        command_lower = command_text.lower()
-        
-        for category, patterns in self.command_patterns.items():
-            for pattern in patterns:
-                match = re.search(pattern, command_lower, re.IGNORECASE)
-                if match:
-                    return category, match
+        union_match = self.union_pattern.search(command_lower)
+        if union_match:
+            # Rematch the pattern on its own where the union matched, so
+            # handlers get a match with that pattern's groups
+            category, pattern = self.pattern_list[int(union_match.lastgroup[1:])]
+            return category, pattern.match(command_lower, union_match.start())
         
         return None, None
     
@@ -154,46 +244,32 @@ class CommandProcessor:
     
     def handle_time(self, command_text):
         """Handle time requests."""
-        now = datetime.now()
-        return f"The current time is {now.strftime('%I:%M %p')}."
+        now = time.localtime()
+        hour = (now.tm_hour - 1) % 12 + 1
+        return f"The current time is {hour:02d}:{now.tm_min:02d} {'AM' if now.tm_hour < 12 else 'PM'}."
     
     def handle_date(self, command_text):
         """Handle date requests."""
-        now = datetime.now()
-        return f"Today is {now.strftime('%A, %B %d, %Y')}."
+        now = time.localtime()
+        return f"Today is {DAY_NAMES[now.tm_wday]}, {MONTH_NAMES[now.tm_mon - 1]} {now.tm_mday:02d}, {now.tm_year}."
     
     def handle_help(self, command_text):
         """Handle help requests."""
-        return ("I can help you with various tasks. Try commands like:\n"
-                "- Open Chrome\n"
-                "- What time is it?\n"
-                "- Shutdown my computer\n"
-                "- Turn off WiFi\n"
-                "- Show my IP address\n"
-                "- Open Task Manager\n"
-                "- Search for the prime minister of India")
+        return HELP_TEXT
     
     def handle_who_are_you(self, command_text):
         """Handle identity questions."""
-        return "I'm Nova, your personal AI assistant. I'm designed to help you control your computer, open applications, search the web, and provide information through voice commands."
+        return WHO_ARE_YOU_TEXT
     
     def handle_what_can_you_do(self, command_text):
         """Handle capability questions."""
-        return ("I can help you with various tasks on your computer. I can open applications, "
-                "control system functions like shutdown or restart, manage network settings, "
-                "open system utilities, and search the web for information. Just tell me what you need!")
+        return WHAT_CAN_YOU_DO_TEXT
     
     def handle_thank_you(self, command_text):
         """Handle thank you messages."""
-        responses = [
-            "You're welcome!",
-            "Happy to help!",
-            "No problem at all!",
-            "Anytime!",
-            "Glad I could assist!"
-        ]
-        import random
-        return random.choice(responses)
+        if not self.thank_you_order:
+            self.thank_you_order.extend(random.sample(self.thank_you_responses, len(self.thank_you_responses)))
+        return self.thank_you_order.popleft()
     
     def handle_exit(self, command_text):
         """Handle exit commands."""
@@ -5,6 +5,7 @@ ResponseGenerator - Generates verbal responses for the assistant.
 import random
 import json
 import os
+from collections import deque
 from datetime import datetime
 
 class ResponseGenerator:
@@ -49,25 +50,37 @@ class ResponseGenerator:
             "Consider it done.",
             "Getting that for you now."
         ]
+        
+        # Shuffled copies of the phrases above, used up before reshuffling
+        self.success_order = deque()
+        self.error_order = deque()
+        self.clarification_order = deque()
+        self.affirmation_order = deque()
     
     def generate_success_response(self, action_description):
         """Generate a success response with the given action description."""
-        template = random.choice(self.success_templates)
+        template = self._next_shuffled(self.success_order, self.success_templates)
         return template.format(action=action_description)
     
     def generate_error_response(self, action_description, reason=""):
         """Generate an error response with the given action and reason."""
-        template = random.choice(self.error_templates)
+        template = self._next_shuffled(self.error_order, self.error_templates)
         return template.format(action=action_description, reason=reason)
     
     def generate_clarification_response(self, action_description):
         """Generate a clarification response with the given action."""
-        template = random.choice(self.clarification_templates)
+        template = self._next_shuffled(self.clarification_order, self.clarification_templates)
         return template.format(action=action_description)
     
     def generate_affirmation(self):
         """Generate a random affirmation phrase."""
-        return random.choice(self.affirmations)
+        return self._next_shuffled(self.affirmation_order, self.affirmations)
+    
+    def _next_shuffled(self, order, phrases):
+        """Return the next phrase from a shuffled order, reshuffling when used up."""
+        if not order:
+            order.extend(random.sample(phrases, len(phrases)))
+        return order.popleft()
         
     def format_system_status(self, status_dict):
         """Format a system status dictionary into a verbal response."""
@@ -87,21 +100,18 @@ class ResponseGenerator:
         if len(items) == 1:
             return f"{intro} {items[0]}."
         
-        formatted_items = ", ".join(items[:-1]) + ", and " + items[-1]
-        return f"{intro} {formatted_items}."
+        return f"{intro} {', '.join(items[:-1])}, and {items[-1]}."
     
     def format_time_duration(self, seconds):
         """Format seconds into a human-readable time duration."""
-        if seconds < 60:
-            return f"{seconds} second{'s' if seconds != 1 else ''}"
-        
-        minutes = seconds // 60
-        if minutes < 60:
-            return f"{minutes} minute{'s' if minutes != 1 else ''}"
-        
-        hours = minutes // 60
-        minutes %= 60
+        minutes, secs = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
         
-        if minutes == 0:
-            return f"{hours} hour{'s' if hours != 1 else ''}"
-        return f"{hours} hour{'s' if hours != 1 else ''} and {minutes} minute{'s' if minutes != 1 else ''}"
\ No newline at end of file
+        # Seconds are only mentioned for durations under a minute
+        if not minutes and not hours:
+            return f"{secs} second{'s'[:secs != 1]}"
+        if not hours:
+            return f"{minutes} minute{'s'[:minutes != 1]}"
+        if not minutes:
+            return f"{hours} hour{'s'[:hours != 1]}"
+        return f"{hours} hour{'s'[:hours != 1]} and {minutes} minute{'s'[:minutes != 1]}"
\ No newline at end of file
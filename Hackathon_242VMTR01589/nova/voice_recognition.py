@@ -6,10 +6,18 @@ import os
 import time
 import threading
 import queue
-from collections import deque
+import logging
+import re
 
 import speech_recognition as sr
 
+logger = logging.getLogger(__name__)
+
+# Longest phrase recorded, in seconds, and how many recorded phrases can wait
+# for recognition before the oldest is dropped
+PHRASE_TIME_LIMIT = 10
+AUDIO_QUEUE_SIZE = 4
+
 class VoiceRecognizer:
     """
     Handles voice recognition and wake word detection.
@@ -25,6 +33,8 @@ class VoiceRecognizer:
         self.recognizer.energy_threshold = 4000  # Default value, will be adjusted
         self.recognizer.pause_threshold = 0.8    # Shorter pause detection
         self.recognizer.phrase_threshold = 0.3   # More sensitive phrase detection
+        # (recordings with less speech than this are dropped while listening,
+        # so brief clicks and bangs never reach the recognition service)
         
         # Wake word (lowercase)
         self.wake_word = "nova"
@@ -32,35 +42,193 @@ class VoiceRecognizer:
         # Alternative wake words (e.g., "hey nova", "hi nova")
         self.alternative_wake_words = ["hey nova", "hi nova", "hello nova", "hey nowa", "hi nowa"]
         
-        # Recent audio buffer for wake word detection
-        self.audio_buffer = deque(maxlen=5)  # Keep last 5 seconds
+        # All wake phrases as a tuple, so one startswith call checks them all
+        self.wake_prefixes = (self.wake_word,) + tuple(self.alternative_wake_words)
+        
+        # Pattern for any wake phrase as whole words, anywhere in the text
+        # (longest first, so "hey nova" wins over "nova")
+        self.wake_word_pattern = re.compile(
+            r"\b(?:" + "|".join(r"\s+".join(map(re.escape, phrase.split()))
+                                for phrase in sorted(self.wake_prefixes, key=len, reverse=True)) + r")\b",
+            re.IGNORECASE)
+        
+        # Microphone kept open between calls (opened on first use), and a
+        # lock so only one thread listens on it at a time
+        self.microphone = None
+        self.microphone_source = None
+        self.microphone_lock = threading.Lock()
+        
+        # Phrases recorded by the background listener, waiting to be
+        # recognized, and the function that stops the background listener
+        self.audio_queue = queue.Queue(maxsize=AUDIO_QUEUE_SIZE)
+        self.stop_background = None
+        
+        # While a command is listened for directly (without the wake word),
+        # phrases go to this queue instead, so the wake word loop can't take them
+        self.direct_audio_queue = queue.Queue(maxsize=1)
+        self.direct_listen_pending = threading.Event()
         
         # Error counters
         self.consecutive_errors = 0
         self.max_consecutive_errors = 3
     
-    def listen_for_audio(self, timeout=None):
-        """Listen for audio input from the microphone."""
-        with sr.Microphone() as source:
+    def start_background_listening(self):
+        """
+        Record phrases on a background thread, so the microphone keeps
+        listening while earlier phrases are being recognized.
+        """
+        if self.stop_background is not None:
+            return
+        
+        # Discard phrases and wake-up sentinels left from an earlier run
+        for audio_queue in (self.audio_queue, self.direct_audio_queue):
+            self._clear_queue(audio_queue)
+        
+        with self.microphone_lock:
+            # The background listener opens the microphone itself
+            self._close_microphone()
             try:
-                # Adjust for ambient noise
-                if self.consecutive_errors > self.max_consecutive_errors:
-                    print("Adjusting for ambient noise...")
+                microphone = sr.Microphone()
+                with microphone as source:
+                    logger.info("Adjusting for ambient noise...")
                     self.recognizer.adjust_for_ambient_noise(source, duration=1)
-                    self.consecutive_errors = 0
-                    
-                print("Listening...")
-                audio = self.recognizer.listen(source, timeout=timeout, phrase_time_limit=10)
-                return audio
-                
-            except sr.WaitTimeoutError:
-                print("Listening timed out, no speech detected")
-                return None
                 
+                self.stop_background = self.recognizer.listen_in_background(
+                    microphone, self._on_audio, phrase_time_limit=PHRASE_TIME_LIMIT)
             except Exception as e:
-                print(f"Error listening for audio: {e}")
-                self.consecutive_errors += 1
+                # Fall back to listening only when asked
+                logger.error("Error starting background listening: %s", e)
+    
+    def stop_background_listening(self):
+        """Stop the background listener and discard phrases it recorded."""
+        if self.stop_background is not None:
+            self.stop_background(wait_for_stop=False)
+            self.stop_background = None
+            
+            # Discard waiting phrases, and wake any thread waiting for one (the
+            # listener may still be queuing a last phrase, so this can't assume
+            # the queue stays empty)
+            for audio_queue in (self.audio_queue, self.direct_audio_queue):
+                self._clear_queue(audio_queue)
+                self._put_latest(audio_queue, None)
+    
+    def _on_audio(self, recognizer, audio):
+        """
+        Queue a phrase recorded by the background listener for the direct
+        listener if one is waiting, otherwise for the wake word loop,
+        dropping the oldest phrase if the queue is full.
+        """
+        if self.direct_listen_pending.is_set():
+            self._put_latest(self.direct_audio_queue, audio)
+        else:
+            self._put_latest(self.audio_queue, audio)
+    
+    def _put_latest(self, audio_queue, item):
+        """Put the item on the queue, dropping the oldest items to make room."""
+        while True:
+            try:
+                audio_queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    audio_queue.get_nowait()
+                except queue.Empty:
+                    pass
+    
+    def _clear_queue(self, audio_queue):
+        """Discard everything waiting on the queue."""
+        while True:
+            try:
+                audio_queue.get_nowait()
+            except queue.Empty:
+                return
+    
+    def listen_for_audio(self, timeout=None, direct=False):
+        """
+        Listen for audio input from the microphone.
+        With direct set, the next phrase goes to this caller rather than to the
+        wake word loop.
+        """
+        # Take the next recorded phrase when the background listener is running
+        if self.stop_background is not None:
+            audio_queue = self.audio_queue
+            if direct:
+                # Discard phrases left over from an earlier direct listen
+                self._clear_queue(self.direct_audio_queue)
+                audio_queue = self.direct_audio_queue
+                self.direct_listen_pending.set()
+            
+            try:
+                return audio_queue.get(timeout=timeout)
+            except queue.Empty:
+                logger.debug("Listening timed out, no speech detected")
                 return None
+            finally:
+                if direct:
+                    self.direct_listen_pending.clear()
+        
+        # Listen on the persistent microphone stream, unless another thread is
+        # already using it, in which case open a separate stream for this call
+        if not self.microphone_lock.acquire(blocking=False):
+            with sr.Microphone() as source:
+                return self._listen(source, timeout)
+        
+        try:
+            # Reopen the stream after repeated errors
+            if self.consecutive_errors > self.max_consecutive_errors:
+                self._close_microphone()
+                self.consecutive_errors = 0
+            
+            if self.microphone_source is None:
+                try:
+                    self.microphone = sr.Microphone()
+                    self.microphone_source = self.microphone.__enter__()
+                    
+                    # Adjust for ambient noise once, when the stream is opened
+                    logger.info("Adjusting for ambient noise...")
+                    self.recognizer.adjust_for_ambient_noise(self.microphone_source, duration=1)
+                except Exception as e:
+                    logger.error("Error opening the microphone: %s", e)
+                    self.consecutive_errors += 1
+                    return None
+            
+            return self._listen(self.microphone_source, timeout)
+        finally:
+            self.microphone_lock.release()
+    
+    def _listen(self, source, timeout):
+        """Record one phrase from an open microphone source."""
+        try:
+            logger.debug("Listening...")
+            audio = self.recognizer.listen(source, timeout=timeout, phrase_time_limit=PHRASE_TIME_LIMIT)
+            return audio
+            
+        except sr.WaitTimeoutError:
+            logger.debug("Listening timed out, no speech detected")
+            return None
+            
+        except Exception as e:
+            logger.error("Error listening for audio: %s", e)
+            self.consecutive_errors += 1
+            return None
+    
+    def close_microphone(self):
+        """Close the persistent microphone stream, once no thread is listening on it."""
+        if self.microphone_lock.acquire(timeout=2.0):
+            try:
+                self._close_microphone()
+            finally:
+                self.microphone_lock.release()
+    
+    def _close_microphone(self):
+        """Close the persistent microphone stream; the caller must hold microphone_lock."""
+        if self.microphone_source is not None:
+            try:
+                self.microphone.__exit__(None, None, None)
+            except Exception as e:
+                logger.error("Error closing the microphone: %s", e)
+            self.microphone = None
+            self.microphone_source = None
     
     def recognize_speech(self, audio):
         """
@@ -77,16 +245,16 @@ class VoiceRecognizer:
             return text.lower()  # Return lowercase text
             
         except sr.UnknownValueError:
-            print("Could not understand audio")
+            logger.debug("Could not understand audio")
             return None
             
         except sr.RequestError as e:
-            print(f"Recognition service error: {e}")
+            logger.warning("Recognition service error: %s", e)
             self.consecutive_errors += 1
             return None
             
         except Exception as e:
-            print(f"Error in speech recognition: {e}")
+            logger.error("Error in speech recognition: %s", e)
             self.consecutive_errors += 1
             return None
     
@@ -105,32 +273,22 @@ class VoiceRecognizer:
         if not text:
             return False
         
-        print(f"Heard: {text}")
-            
-        # Check if the wake word is in the recognized text
-        text_lower = text.lower()
-        
-        # Check for the main wake word
-        if self.wake_word in text_lower:
-            return True
+        logger.debug("Heard: %s", text)
             
-        # Check for alternative wake phrases
-        for phrase in self.alternative_wake_words:
-            if phrase in text_lower:
-                return True
-        
-        return False
+        # Check if any wake phrase is in the recognized text
+        return bool(self.wake_word_pattern.search(text))
     
-    def listen_for_command(self, timeout=5):
+    def listen_for_command(self, timeout=5, direct=False):
         """
-        Listen for a command after the wake word is detected.
+        Listen for a command after the wake word is detected, or with direct
+        set, when asked for one outside the wake word loop.
         Returns the command text or None if no command is recognized.
         """
         # Provide visual and audio feedback that wake word was detected
         self.assistant.on_wake_word_detected()
         
         # Listen for audio
-        audio = self.listen_for_audio(timeout)
+        audio = self.listen_for_audio(timeout, direct=direct)
         if not audio:
             return None
             
@@ -140,38 +298,31 @@ class VoiceRecognizer:
     def detect_wake_word_and_command(self, timeout=None):
         """
         Listen for the wake word and the command in the same utterance.
-        Returns the command part if the wake word is detected at the beginning,
-        or None if no wake word is detected or no command follows.
+        Returns (wake_word_detected, command): the command part is given if the
+        wake word is at the beginning and a command follows it, otherwise None.
         """
         # Listen for audio
         audio = self.listen_for_audio(timeout)
         if not audio:
-            return None
+            return False, None
             
         # Recognize speech
         text = self.recognize_speech(audio)
         if not text:
-            return None
+            return False, None
             
         text_lower = text.lower()
-        print(f"Heard full phrase: {text_lower}")
+        logger.debug("Heard full phrase: %s", text_lower)
         
-        # Check if the text starts with the wake word
-        if text_lower.startswith(self.wake_word):
-            # Extract the command part (everything after the wake word)
-            command = text_lower[len(self.wake_word):].strip()
+        # Check if the text starts with the wake word or an alternative wake phrase
+        if text_lower.startswith(self.wake_prefixes):
+            # Extract the command part (everything after the wake phrase)
+            phrase = next(phrase for phrase in self.wake_prefixes if text_lower.startswith(phrase))
+            command = text_lower[len(phrase):].strip()
             if command:
-                return command
-                
-        # Check if the text starts with any alternative wake phrases
-        for phrase in self.alternative_wake_words:
-            if text_lower.startswith(phrase):
-                # Extract the command part (everything after the wake phrase)
-                command = text_lower[len(phrase):].strip()
-                if command:
-                    return command
-        
-        # If we detected just the wake word without a command, return None
-        # This will trigger the system to listen for a follow-up command
-        self.assistant.on_wake_word_detected()
-        return None 
\ No newline at end of file
+                return True, command
+        
+        # Otherwise report whether the wake word was heard on its own, so the
+        # caller can listen for a follow-up command without recognizing
+        # another utterance just to find the wake word
+        return bool(self.wake_word_pattern.search(text_lower)), None 
\ No newline at end of file
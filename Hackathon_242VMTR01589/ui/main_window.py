@@ -5,22 +5,117 @@ NovaUI - Main user interface for the Nova assistant.
 import os
 import sys
 import time
-from datetime import datetime
-import threading
+import functools
 
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
-                             QHBoxLayout, QPushButton, QLabel, QTextEdit, 
-                             QLineEdit, QFrame, QSizePolicy, QSpacerItem)
-from PyQt5.QtCore import Qt, QSize, pyqtSignal, pyqtSlot, QThread, QTimer, QPropertyAnimation, QEasingCurve
-from PyQt5.QtGui import QFont, QIcon, QPixmap, QColor, QPalette, QMovie
+                             QHBoxLayout, QPushButton, QLabel, QPlainTextEdit, 
+                             QLineEdit, QFrame, QSizePolicy, QSpacerItem,
+                             QGraphicsColorizeEffect)
+from PyQt5.QtCore import Qt, QSize, pyqtSignal, pyqtSlot, QThread, QTimer, QRunnable, QThreadPool, QPropertyAnimation, QEasingCurve
+from PyQt5.QtGui import QFont, QTextCursor, QIcon, QPixmap, QColor, QPalette, QMovie
 
-from ui.styles import NovaStyles
+from ui import styles
+
+# Most blocks kept in the conversation history (a message takes one block);
+# the oldest are dropped first, so layout stays cheap in long sessions
+MAX_CONVERSATION_BLOCKS = 500
+
+# Milliseconds between applying queued status changes, so bursts of assistant
+# state changes cause at most one update (and repaint) per interval
+UI_UPDATE_INTERVAL_MS = 33
+
+# Fonts used by the window, by name, as (point size, weight) of FONT_FAMILY
+FONT_FAMILY = "Segoe UI"
+FONT_SPECS = {
+    "title": (24, QFont.Bold),
+    "status": (12, QFont.Normal),
+    "body": (11, QFont.Normal),
+    "voice_button": (16, QFont.Normal),
+    "help_title": (12, QFont.Bold),
+    "help": (10, QFont.Normal),
+}
+
+@functools.lru_cache(maxsize=None)
+def get_font(name):
+    """Get a named window font, created on first use (a QFont needs the QApplication)."""
+    size, weight = FONT_SPECS[name]
+    return QFont(FONT_FAMILY, size, weight)
+
+# Conversation message markup; the look comes from the conversation area's
+# document style sheet (styles.MESSAGE_STYLE). A QPlainTextEdit lays every
+# block out alike (no alignment or block margins), so messages are told apart
+# by sender labels and character colors, one line each
+USER_MESSAGE_HTML = ('<span class="timestamp">{timestamp}</span> <span class="sender">You:</span> '
+                     '<span class="user">&nbsp;{message}&nbsp;</span>')
+ASSISTANT_MESSAGE_HTML = ('<span class="timestamp">{timestamp}</span> <span class="sender">Nova:</span> '
+                          '<span class="assistant">&nbsp;{message}&nbsp;</span>')
+SYSTEM_MESSAGE_HTML = '<span class="system">{message}</span>'
+
+class DirectCommandListener(QRunnable):
+    """
+    Listens for a single command (without wake word) on a thread pool thread,
+    reporting back to the window through its signals.
+    """
+    
+    def __init__(self, window):
+        """Initialize the listener for the given main window."""
+        super().__init__()
+        self.window = window
+    
+    def run(self):
+        """Listen for a command and process it, off the UI thread."""
+        try:
+            command = self.window.assistant.recognizer.listen_for_command(timeout=5, direct=True)
+            if command:
+                self.window.direct_command_received.emit(command)
+                self.window.assistant.process_command(command)
+            else:
+                self.window.direct_listen_failed.emit("I didn't hear a command. Please try again.")
+        except Exception as e:
+            self.window.direct_listen_failed.emit(f"Error listening: {str(e)}")
+
+class AssistantStarter(QThread):
+    """
+    Starts the assistant's services (opening and calibrating the microphone)
+    on a worker thread, so the window is usable meanwhile.
+    """
+    
+    # Raised once the assistant is listening, or with the error if it couldn't start
+    ready = pyqtSignal()
+    failed = pyqtSignal(str)
+    
+    def __init__(self, assistant):
+        """Initialize the starter for the given assistant."""
+        super().__init__()
+        self.assistant = assistant
+    
+    def run(self):
+        """Start the assistant."""
+        try:
+            self.assistant.start()
+            self.ready.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
 
 class NovaUI(QMainWindow):
     """
     Main window for the Nova assistant.
     """
     
+    # Assistant events, which are raised on the assistant's worker threads and
+    # delivered to the handlers below on the UI thread
+    listening_started = pyqtSignal()
+    listening_stopped = pyqtSignal()
+    processing_started = pyqtSignal()
+    processing_stopped = pyqtSignal()
+    speaking_started = pyqtSignal(str)
+    speaking_stopped = pyqtSignal()
+    wake_word_detected = pyqtSignal()
+    
+    # Results of listening for a command directly, raised on a thread pool thread
+    direct_command_received = pyqtSignal(str)
+    direct_listen_failed = pyqtSignal(str)
+    
     def __init__(self, assistant):
         """Initialize the main UI window."""
         super().__init__()
@@ -28,14 +123,47 @@ class NovaUI(QMainWindow):
         # Store reference to the assistant
         self.assistant = assistant
         
-        # Connect assistant events to UI
-        self.assistant.on_listening_started = self.on_listening_started
-        self.assistant.on_listening_stopped = self.on_listening_stopped
-        self.assistant.on_processing_started = self.on_processing_started
-        self.assistant.on_processing_stopped = self.on_processing_stopped
-        self.assistant.on_speaking_started = self.on_speaking_started
-        self.assistant.on_speaking_stopped = self.on_speaking_stopped
-        self.assistant.on_wake_word_detected = self.on_wake_word_detected
+        # Connect assistant events to UI, through signals so the handlers run
+        # on the UI thread whichever thread the assistant raises them from
+        self.listening_started.connect(self.on_listening_started)
+        self.listening_stopped.connect(self.on_listening_stopped)
+        self.processing_started.connect(self.on_processing_started)
+        self.processing_stopped.connect(self.on_processing_stopped)
+        self.speaking_started.connect(self.on_speaking_started)
+        self.speaking_stopped.connect(self.on_speaking_stopped)
+        self.wake_word_detected.connect(self.on_wake_word_detected)
+        
+        self.assistant.on_listening_started = self.listening_started.emit
+        self.assistant.on_listening_stopped = self.listening_stopped.emit
+        self.assistant.on_processing_started = self.processing_started.emit
+        self.assistant.on_processing_stopped = self.processing_stopped.emit
+        self.assistant.on_speaking_started = self.speaking_started.emit
+        self.assistant.on_speaking_stopped = self.speaking_stopped.emit
+        self.assistant.on_wake_word_detected = self.wake_word_detected.emit
+        
+        # Connect direct command listening results to UI
+        self.direct_command_received.connect(self.add_user_message)
+        self.direct_listen_failed.connect(self.on_direct_listen_failed)
+        
+        # Status label text and state, and voice button state, waiting to be
+        # applied on the next UI update
+        self.pending_status = None
+        self.pending_voice_button_state = None
+        
+        # Status label text and state, and voice button state, as last shown,
+        # so unchanged values aren't applied (and repainted) again
+        self.shown_status_text = "Ready"
+        self.shown_status_state = "ready"
+        self.shown_voice_button_state = "idle"
+        
+        # Message timestamp ("HH:MM") and the minute it was formatted for
+        self.timestamp = ""
+        self.timestamp_minute = None
+        
+        self.ui_update_timer = QTimer()
+        self.ui_update_timer.setSingleShot(True)
+        self.ui_update_timer.setInterval(UI_UPDATE_INTERVAL_MS)
+        self.ui_update_timer.timeout.connect(self.apply_pending_state)
         
         # Set up the UI
         self.init_ui()
@@ -45,8 +173,12 @@ class NovaUI(QMainWindow):
         self.wave_timer = QTimer()
         self.wave_timer.timeout.connect(self.stop_wave_animation)
         
-        # Start the assistant
-        QTimer.singleShot(1000, self.assistant.start)
+        # Start the assistant in the background; voice input is enabled once it's ready
+        self.voice_button.setEnabled(False)
+        self.assistant_starter = AssistantStarter(self.assistant)
+        self.assistant_starter.ready.connect(self.on_assistant_ready)
+        self.assistant_starter.failed.connect(self.on_assistant_start_failed)
+        self.assistant_starter.start()
     
     def get_icon_path(self, icon_name):
         """Get the path to an icon file, with fallback for missing files."""
@@ -80,8 +212,7 @@ class NovaUI(QMainWindow):
         main_layout.setSpacing(15)
         
         # Apply styles
-        self.styles = NovaStyles()
-        self.setStyleSheet(self.styles.get_main_style())
+        self.setStyleSheet(styles.MAIN_STYLE)
         
         # Create header with logo and title
         header_layout = QHBoxLayout()
@@ -90,8 +221,14 @@ class NovaUI(QMainWindow):
         # placeholder for the logo - in real app, replace with actual logo
         self.logo_label.setStyleSheet("background-color: #4A6FFF; border-radius: 32px;")
         
+        # Tint the logo through a graphics effect, so its color can be animated
+        # without re-parsing the stylesheet on every frame
+        self.logo_effect = QGraphicsColorizeEffect(self.logo_label)
+        self.logo_effect.setColor(QColor("#4A6FFF"))
+        self.logo_label.setGraphicsEffect(self.logo_effect)
+        
         title_label = QLabel("Nova AI Assistant")
-        title_label.setFont(QFont("Segoe UI", 24, QFont.Bold))
+        title_label.setFont(get_font("title"))
         title_label.setStyleSheet("color: #4A6FFF;")
         
         # header_layout.addWidget(self.logo_label)
@@ -100,14 +237,18 @@ class NovaUI(QMainWindow):
         
         # Status indicator
         self.status_label = QLabel("Ready")
-        self.status_label.setFont(QFont("Segoe UI", 12))
-        self.status_label.setStyleSheet("color: #6C757D;")
+        self.status_label.setFont(get_font("status"))
+        self.status_label.setProperty("state", "ready")
+        self.status_label.setStyleSheet(styles.STATUS_LABEL_STYLE)
         
-        # Conversation history
-        self.conversation_area = QTextEdit()
+        # Conversation history, as a plain text edit (whose block-based layout
+        # stays fast as the history grows) with bounded scrollback
+        self.conversation_area = QPlainTextEdit()
         self.conversation_area.setReadOnly(True)
-        self.conversation_area.setFont(QFont("Segoe UI", 11))
-        self.conversation_area.setStyleSheet(self.styles.get_conversation_style())
+        self.conversation_area.setMaximumBlockCount(MAX_CONVERSATION_BLOCKS)
+        self.conversation_area.setFont(get_font("body"))
+        self.conversation_area.setStyleSheet(styles.CONVERSATION_STYLE)
+        self.conversation_area.document().setDefaultStyleSheet(styles.MESSAGE_STYLE)
         self.conversation_area.setMinimumHeight(300)
         
         # Input area
@@ -116,7 +257,8 @@ class NovaUI(QMainWindow):
         # Voice input button
         self.voice_button = QPushButton()
         self.voice_button.setFixedSize(50, 50)
-        self.voice_button.setStyleSheet(self.styles.get_voice_button_style())
+        self.voice_button.setProperty("state", "idle")
+        self.voice_button.setStyleSheet(styles.VOICE_BUTTON_STYLE)
         
         # Try to set the mic icon
         mic_icon_path = self.get_icon_path("mic_icon.png")
@@ -126,22 +268,22 @@ class NovaUI(QMainWindow):
         else:
             # If no icon is available, use text instead
             self.voice_button.setText("🎤")
-            self.voice_button.setFont(QFont("Segoe UI", 16))
+            self.voice_button.setFont(get_font("voice_button"))
         
         self.voice_button.clicked.connect(self.toggle_voice_input)
         
         # Text input
         self.text_input = QLineEdit()
         self.text_input.setPlaceholderText("Type a command or say 'Nova' to activate voice...")
-        self.text_input.setFont(QFont("Segoe UI", 11))
-        self.text_input.setStyleSheet(self.styles.get_text_input_style())
+        self.text_input.setFont(get_font("body"))
+        self.text_input.setStyleSheet(styles.TEXT_INPUT_STYLE)
         self.text_input.setMinimumHeight(50)
         self.text_input.returnPressed.connect(self.send_text_command)
         
         # Send button
         self.send_button = QPushButton("Send")
         self.send_button.setFixedSize(80, 50)
-        self.send_button.setStyleSheet(self.styles.get_send_button_style())
+        self.send_button.setStyleSheet(styles.SEND_BUTTON_STYLE)
         self.send_button.clicked.connect(self.send_text_command)
         
         input_layout.addWidget(self.voice_button)
@@ -150,12 +292,12 @@ class NovaUI(QMainWindow):
         
         # Help/tips section
         self.help_frame = QFrame()
-        self.help_frame.setStyleSheet(self.styles.get_help_frame_style())
+        self.help_frame.setStyleSheet(styles.HELP_FRAME_STYLE)
         self.help_frame.setMinimumHeight(100)
         
         help_layout = QVBoxLayout(self.help_frame)
         help_title = QLabel("Example Commands:")
-        help_title.setFont(QFont("Segoe UI", 12, QFont.Bold))
+        help_title.setFont(get_font("help_title"))
         
         help_commands = QLabel(
             "• 'Nova, open Chrome'\n"
@@ -163,7 +305,7 @@ class NovaUI(QMainWindow):
             "• 'Nova, show my IP address'\n"
             "• 'Nova, search for prime minister of India'"
         )
-        help_commands.setFont(QFont("Segoe UI", 10))
+        help_commands.setFont(get_font("help"))
         
         help_layout.addWidget(help_title)
         help_layout.addWidget(help_commands)
@@ -184,30 +326,20 @@ class NovaUI(QMainWindow):
     def toggle_voice_input(self):
         """Toggle voice input on/off."""
         if not self.assistant.is_listening:
-            self.voice_button.setStyleSheet(self.styles.get_voice_button_active_style())
+            self.set_voice_button_state("active")
             self.add_system_message("Listening for command...")
-            self.status_label.setText("Listening...")
-            self.status_label.setStyleSheet("color: #28A745;")
+            self.set_status("Listening...", "listening")
             
             # Start listening for a command directly (without wake word)
-            threading.Thread(target=self.listen_for_direct_command).start()
+            QThreadPool.globalInstance().start(DirectCommandListener(self))
         else:
-            self.voice_button.setStyleSheet(self.styles.get_voice_button_style())
+            self.set_voice_button_state("idle")
             self.assistant.stop()
     
-    def listen_for_direct_command(self):
-        """Listen for a command directly (without wake word)."""
-        try:
-            command = self.assistant.recognizer.listen_for_command(timeout=5)
-            if command:
-                self.add_user_message(command)
-                self.assistant.process_command(command)
-            else:
-                self.add_system_message("I didn't hear a command. Please try again.")
-                self.reset_ui_state()
-        except Exception as e:
-            self.add_system_message(f"Error listening: {str(e)}")
-            self.reset_ui_state()
+    def on_direct_listen_failed(self, message):
+        """Handle listening for a direct command failing or hearing nothing."""
+        self.add_system_message(message)
+        self.reset_ui_state()
     
     def send_text_command(self):
         """Send a text command from the input field."""
@@ -219,67 +351,101 @@ class NovaUI(QMainWindow):
         self.add_user_message(command)
         self.assistant.process_command(command)
     
+    def get_timestamp(self):
+        """Get the current time as "HH:MM", formatting it at most once a minute."""
+        minute = int(time.time()) // 60
+        if minute != self.timestamp_minute:
+            self.timestamp = time.strftime("%H:%M")
+            self.timestamp_minute = minute
+        return self.timestamp
+    
     def add_user_message(self, message):
         """Add a user message to the conversation area."""
-        timestamp = datetime.now().strftime("%H:%M")
-        html = f'<div style="margin-bottom: 10px; text-align: right;">'
-        html += f'<span style="background-color: #4A6FFF; color: white; padding: 8px 12px; border-radius: 15px; display: inline-block; max-width: 70%; text-align: left;">{message}</span>'
-        html += f'<div style="font-size: 10px; color: #6C757D; margin-top: 2px;">{timestamp}</div>'
-        html += '</div>'
-        
-        self.conversation_area.append(html)
-        self.conversation_area.verticalScrollBar().setValue(
-            self.conversation_area.verticalScrollBar().maximum()
-        )
+        timestamp = self.get_timestamp()
+        html = USER_MESSAGE_HTML.format(message=message, timestamp=timestamp)
+        
+        self.conversation_area.appendHtml(html)
+        self.conversation_area.moveCursor(QTextCursor.End)
     
     def add_assistant_message(self, message):
         """Add an assistant message to the conversation area."""
-        timestamp = datetime.now().strftime("%H:%M")
-        html = f'<div style="margin-bottom: 10px;">'
-        html += f'<span style="background-color: #E9ECEF; color: #212529; padding: 8px 12px; border-radius: 15px; display: inline-block; max-width: 70%;">{message}</span>'
-        html += f'<div style="font-size: 10px; color: #6C757D; margin-top: 2px;">{timestamp}</div>'
-        html += '</div>'
-        
-        self.conversation_area.append(html)
-        self.conversation_area.verticalScrollBar().setValue(
-            self.conversation_area.verticalScrollBar().maximum()
-        )
+        timestamp = self.get_timestamp()
+        html = ASSISTANT_MESSAGE_HTML.format(message=message, timestamp=timestamp)
+        
+        self.conversation_area.appendHtml(html)
+        self.conversation_area.moveCursor(QTextCursor.End)
     
     def add_system_message(self, message):
         """Add a system message to the conversation area."""
-        html = f'<div style="margin: 5px 0; text-align: center;">'
-        html += f'<span style="font-size: 11px; color: #6C757D;">{message}</span>'
-        html += '</div>'
+        html = SYSTEM_MESSAGE_HTML.format(message=message)
         
-        self.conversation_area.append(html)
-        self.conversation_area.verticalScrollBar().setValue(
-            self.conversation_area.verticalScrollBar().maximum()
-        )
+        self.conversation_area.appendHtml(html)
+        self.conversation_area.moveCursor(QTextCursor.End)
     
     def reset_ui_state(self):
         """Reset the UI to its default state."""
-        self.voice_button.setStyleSheet(self.styles.get_voice_button_style())
-        self.status_label.setText("Ready")
-        self.status_label.setStyleSheet("color: #6C757D;")
+        self.set_voice_button_state("idle")
+        self.set_status("Ready", "ready")
         
         # Stop any animations
         if self.wave_animation and self.wave_animation.state() == QPropertyAnimation.Running:
             self.wave_animation.stop()
-            self.logo_label.setStyleSheet("background-color: #4A6FFF; border-radius: 32px;")
+            self.logo_effect.setColor(QColor("#4A6FFF"))
+    
+    def set_status(self, text, state):
+        """Queue a status label change for the next UI update."""
+        self.pending_status = (text, state)
+        if not self.ui_update_timer.isActive():
+            self.ui_update_timer.start()
+    
+    def set_voice_button_state(self, state):
+        """Queue a voice button state change for the next UI update."""
+        self.pending_voice_button_state = state
+        if not self.ui_update_timer.isActive():
+            self.ui_update_timer.start()
+    
+    def apply_pending_state(self):
+        """Apply the latest queued status label and voice button changes."""
+        if self.pending_status:
+            text, state = self.pending_status
+            if text != self.shown_status_text:
+                self.status_label.setText(text)
+                self.shown_status_text = text
+            if state != self.shown_status_state:
+                self.set_widget_state(self.status_label, state)
+                self.shown_status_state = state
+            self.pending_status = None
+        
+        if self.pending_voice_button_state:
+            if self.pending_voice_button_state != self.shown_voice_button_state:
+                self.set_widget_state(self.voice_button, self.pending_voice_button_state)
+                self.shown_voice_button_state = self.pending_voice_button_state
+            self.pending_voice_button_state = None
+    
+    def set_widget_state(self, widget, state):
+        """Switch a widget to the look its stylesheet gives the [state="..."] property."""
+        widget.setProperty("state", state)
+        
+        # Re-apply the already parsed stylesheet for the new property value
+        widget.style().unpolish(widget)
+        widget.style().polish(widget)
     
     def start_wave_animation(self):
         """Start the waving animation on the logo."""
-        # Create a pulsing animation for the logo
-        self.wave_animation = QPropertyAnimation(self.logo_label, b"styleSheet")
-        self.wave_animation.setDuration(800)  # Animation duration in ms
-        self.wave_animation.setLoopCount(3)   # Repeat 3 times
-        
-        # Define the animation keyframes
-        self.wave_animation.setStartValue("background-color: #4A6FFF; border-radius: 32px;")
-        self.wave_animation.setEndValue("background-color: #FF4A6F; border-radius: 32px;")
-        
-        # Set easing curve for smooth animation
-        self.wave_animation.setEasingCurve(QEasingCurve.InOutQuad)
+        # Create a pulsing animation of the logo tint (created once, then reused)
+        if self.wave_animation is None:
+            self.wave_animation = QPropertyAnimation(self.logo_effect, b"color")
+            self.wave_animation.setDuration(800)  # Animation duration in ms
+            self.wave_animation.setLoopCount(3)   # Repeat 3 times
+            
+            # Define the animation keyframes
+            self.wave_animation.setStartValue(QColor("#4A6FFF"))
+            self.wave_animation.setEndValue(QColor("#FF4A6F"))
+            
+            # Set easing curve for smooth animation
+            self.wave_animation.setEasingCurve(QEasingCurve.InOutQuad)
+        else:
+            self.wave_animation.stop()
         
         # Start the animation
         self.wave_animation.start()
@@ -298,42 +464,44 @@ class NovaUI(QMainWindow):
         # Reset the logo if animation is still running
         if self.wave_animation and self.wave_animation.state() == QPropertyAnimation.Running:
             self.wave_animation.stop()
-            self.logo_label.setStyleSheet("background-color: #4A6FFF; border-radius: 32px;")
+            self.logo_effect.setColor(QColor("#4A6FFF"))
     
     # Event handlers for assistant states
+    def on_assistant_ready(self):
+        """Handle the assistant having started."""
+        self.voice_button.setEnabled(True)
+    
+    def on_assistant_start_failed(self, error):
+        """Handle the assistant failing to start."""
+        self.add_system_message(f"Voice input is unavailable: {error}")
     
     def on_listening_started(self):
         """Called when the assistant starts listening."""
-        self.voice_button.setStyleSheet(self.styles.get_voice_button_active_style())
-        self.status_label.setText("Listening...")
-        self.status_label.setStyleSheet("color: #28A745;")
+        self.set_voice_button_state("active")
+        self.set_status("Listening...", "listening")
     
     def on_listening_stopped(self):
         """Called when the assistant stops listening."""
-        self.voice_button.setStyleSheet(self.styles.get_voice_button_style())
+        self.set_voice_button_state("idle")
         # Stop wave animation if it's still running
         self.stop_wave_animation()
     
     def on_processing_started(self):
         """Called when the assistant starts processing a command."""
-        self.status_label.setText("Processing...")
-        self.status_label.setStyleSheet("color: #FFC107;")
+        self.set_status("Processing...", "processing")
     
     def on_processing_stopped(self):
         """Called when the assistant finishes processing a command."""
-        self.status_label.setText("Ready")
-        self.status_label.setStyleSheet("color: #6C757D;")
+        self.set_status("Ready", "ready")
     
     def on_speaking_started(self, text):
         """Called when the assistant starts speaking."""
         self.add_assistant_message(text)
-        self.status_label.setText("Speaking...")
-        self.status_label.setStyleSheet("color: #17A2B8;")
+        self.set_status("Speaking...", "speaking")
     
     def on_speaking_stopped(self):
         """Called when the assistant stops speaking."""
-        self.status_label.setText("Ready")
-        self.status_label.setStyleSheet("color: #6C757D;")
+        self.set_status("Ready", "ready")
     
     def on_wake_word_detected(self):
         """Called when the wake word is detected."""
@@ -341,11 +509,11 @@ class NovaUI(QMainWindow):
         self.start_wave_animation()
         
         # Update status label
-        self.status_label.setText("Listening...")
-        self.status_label.setStyleSheet("color: #FF4A6F;")
+        self.set_status("Listening...", "wake_word")
     
     def closeEvent(self, event):
         """Handle window close event."""
-        # Stop the assistant before closing
-        self.assistant.stop()
+        # Stop the assistant before closing (once it has finished starting)
+        self.assistant_starter.wait()
+        self.assistant.shutdown()
         event.accept() 
\ No newline at end of file
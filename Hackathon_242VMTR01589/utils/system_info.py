@@ -10,12 +10,67 @@ import psutil
 import datetime
 import uuid
 import time
+import threading
+import concurrent.futures
+
+# Units for format_bytes, each 1024 times the previous one
+BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+# How long, in seconds, to reuse CPU, memory and disk readings
+SYSTEM_INFO_TTL = 2
+
+# Longest wait, in seconds, for the hostname to resolve to an IP address, and
+# how long to reuse a resolved address (it changes with the network)
+HOST_LOOKUP_TIMEOUT = 2
+IP_ADDRESS_TTL = 60
+
+# Last resolved (IP address, expiry time)
+_ip_address_cache = (None, 0)
+
+# Details that don't change while Nova runs, gathered on first use
+_static_info = None
+
+# Last (readings, expiry time) of the details that do change
+_dynamic_info = (None, 0)
+
+# How long, in seconds, to reuse a public IP address lookup, and how soon to
+# retry one that failed
+PUBLIC_IP_TTL = 300
+PUBLIC_IP_RETRY = 5
+
+# Last (public IP, expiry time), and whether a lookup is under way
+_public_ip_cache = ("Could not determine", 0)
+_public_ip_refreshing = False
+_public_ip_lock = threading.Lock()
+
+# Start the CPU usage counter, so later non-blocking reads measure from here
+psutil.cpu_percent(interval=None)
 
 def get_system_info():
     """
     Get comprehensive system information.
     Returns a dictionary of system information.
     """
+    # Resolve the IP address in the background (DNS can be slow) while the
+    # other details are gathered
+    ip_address_future = _start_ip_address_lookup()
+    
+    info = dict(_get_static_info())
+    info.update(_get_dynamic_info())
+    info["ip_address"] = _get_ip_address(ip_address_future)
+    
+    # System Uptime
+    uptime_seconds = int(time.time() - info.pop("boot_time"))
+    info["system_uptime"] = format_time_delta(uptime_seconds)
+    
+    return info
+
+def _get_static_info():
+    """Get the system details that don't change, gathering them only once."""
+    global _static_info
+    if _static_info is not None:
+        return _static_info
+    
     info = {}
     
     # OS Information
@@ -26,7 +81,63 @@ def get_system_info():
     # CPU Information
     info["cpu_count"] = psutil.cpu_count(logical=False)
     info["cpu_logical_count"] = psutil.cpu_count(logical=True)
-    info["cpu_percent"] = psutil.cpu_percent(interval=1)
+    
+    # Network Information
+    info["hostname"] = socket.gethostname()
+    
+    # Machine Information
+    info["machine_type"] = platform.machine()
+    info["processor"] = platform.processor()
+    info["boot_time"] = psutil.boot_time()
+    
+    # User Information
+    info["user"] = os.getlogin()
+    
+    _static_info = info
+    return info
+
+def _start_ip_address_lookup():
+    """
+    Start resolving the hostname to an IP address on a background thread.
+    Returns the lookup's future, or None if a recent address is cached.
+    """
+    if time.monotonic() < _ip_address_cache[1]:
+        return None
+    
+    # The executor isn't waited on, so a slow lookup can't hold up the caller
+    # past HOST_LOOKUP_TIMEOUT
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(socket.gethostbyname, socket.gethostname())
+    executor.shutdown(wait=False)
+    return future
+
+def _get_ip_address(future):
+    """Get the IP address from a lookup started by _start_ip_address_lookup."""
+    global _ip_address_cache
+    ip_address = _ip_address_cache[0]
+    if future is None:
+        return ip_address
+    
+    # Only resolved addresses are cached, so a failed lookup is retried next time
+    try:
+        ip_address = future.result(timeout=HOST_LOOKUP_TIMEOUT)
+        _ip_address_cache = (ip_address, time.monotonic() + IP_ADDRESS_TTL)
+    except:
+        pass
+    return ip_address or "127.0.0.1"
+
+def _get_dynamic_info():
+    """Get CPU, memory and disk usage, reusing readings newer than SYSTEM_INFO_TTL."""
+    global _dynamic_info
+    info, expiry = _dynamic_info
+    now = time.monotonic()
+    if info is not None and now < expiry:
+        return info
+    
+    info = {}
+    
+    # CPU usage since the previous reading (doesn't block)
+    info["cpu_percent"] = psutil.cpu_percent(interval=None)
     
     # Memory Information
     memory = psutil.virtual_memory()
@@ -42,24 +153,7 @@ def get_system_info():
     info["disk_used"] = format_bytes(disk.used)
     info["disk_percent"] = disk.percent
     
-    # Network Information
-    info["hostname"] = socket.gethostname()
-    try:
-        info["ip_address"] = socket.gethostbyname(socket.gethostname())
-    except:
-        info["ip_address"] = "127.0.0.1"
-    
-    # Machine Information
-    info["machine_type"] = platform.machine()
-    info["processor"] = platform.processor()
-    
-    # System Uptime
-    uptime_seconds = int(time.time() - psutil.boot_time())
-    info["system_uptime"] = format_time_delta(uptime_seconds)
-    
-    # User Information
-    info["user"] = os.getlogin()
-    
+    _dynamic_info = (info, now + SYSTEM_INFO_TTL)
     return info
 
 def get_battery_status():
@@ -92,6 +186,9 @@ def get_network_connections():
     """
     connections = []
     
+    # Look up every process name once, rather than once per connection
+    pid_names = {p.pid: p.info['name'] for p in psutil.process_iter(['name'])}
+    
     for conn in psutil.net_connections(kind='inet'):
         connection_info = {}
         
@@ -103,10 +200,10 @@ def get_network_connections():
         
         connection_info["status"] = conn.status
         
-        try:
-            connection_info["process"] = psutil.Process(conn.pid).name() if conn.pid else "Unknown"
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            connection_info["process"] = "Access Denied"
+        if conn.pid:
+            connection_info["process"] = pid_names.get(conn.pid) or "Access Denied"
+        else:
+            connection_info["process"] = "Unknown"
         
         connections.append(connection_info)
     
@@ -114,11 +211,12 @@ def get_network_connections():
 
 def format_bytes(bytes_value):
     """Format bytes into a human-readable string."""
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if bytes_value < 1024:
-            return f"{bytes_value:.2f} {unit}"
-        bytes_value /= 1024
-    return f"{bytes_value:.2f} PB"
+    if bytes_value < 1024:
+        return f"{bytes_value:.2f} B"
+    
+    # Each unit is 2**10 times the last, so the bit length picks the unit
+    unit_index = min(int(bytes_value).bit_length() - 1, 50) // 10
+    return f"{bytes_value / (1 << (10 * unit_index)):.2f} {BYTE_UNITS[unit_index]}"
 
 def format_time_delta(seconds):
     """Format seconds into a human-readable time string."""
@@ -143,12 +241,38 @@ def get_mac_address():
     return mac
 
 def get_public_ip():
-    """Get the public IP address of the machine."""
+    """
+    Get the public IP address of the machine without blocking.
+    Returns the last known address, refreshing it in the background once it's
+    older than PUBLIC_IP_TTL.
+    """
+    global _public_ip_refreshing
+    value, expiry = _public_ip_cache
+    
+    # Start a background lookup if the address is stale and none is running
+    with _public_ip_lock:
+        if time.monotonic() >= expiry and not _public_ip_refreshing:
+            _public_ip_refreshing = True
+            threading.Thread(target=_refresh_public_ip, daemon=True).start()
+    
+    return value
+
+def _refresh_public_ip():
+    """Look up the public IP address and store it in the cache."""
+    global _public_ip_cache, _public_ip_refreshing
+    value = None
     try:
         import requests
         response = requests.get('https://api.ipify.org', timeout=3)
         if response.status_code == 200:
-            return response.text
+            value = response.text
     except:
         pass
-    return "Could not determine" 
\ No newline at end of file
+    
+    # On failure keep the last known address, and retry soon
+    with _public_ip_lock:
+        if value:
+            _public_ip_cache = (value, time.monotonic() + PUBLIC_IP_TTL)
+        else:
+            _public_ip_cache = (_public_ip_cache[0], time.monotonic() + PUBLIC_IP_RETRY)
+        _public_ip_refreshing = False
\ No newline at end of file